@@ -37,7 +37,8 @@ class AlertManager:
             try:
                 from .console_dispatcher import ConsoleDispatcher
                 self.dispatchers['console'] = ConsoleDispatcher(
-                    log_to_file=console_config.get('log_to_file', False)
+                    log_to_file=console_config.get('log_to_file', False),
+                    max_history=console_config.get('max_history', 10000)
                 )
                 print("✅ Console alerts initialized")
             except ImportError as e:
@@ -1,46 +1,57 @@
+from collections import defaultdict, deque
 from datetime import datetime
-from typing import Optional, List
+from itertools import islice
+from typing import Optional, List, TextIO
 import json
 
 class ConsoleDispatcher:
     """Console-based alert dispatcher for testing and development"""
     
-    def __init__(self, log_to_file: bool = False, log_file: str = "alerts.log"):
+    def __init__(self, log_to_file: bool = False, log_file: str = "alerts.log",
+                 max_history: Optional[int] = 10000, log_stream: Optional[TextIO] = None):
         self.log_to_file = log_to_file
         self.log_file = log_file
-        self.alerts_history = []
+        # Open text stream to log to instead of log_file (e.g. io.StringIO)
+        self.log_stream = log_stream
+        # Only the most recent max_history alerts are kept in memory (None keeps all)
+        self.max_history = max_history
+        self.alerts_history = deque(maxlen=max_history)
+        # Alerts keyed by their 'type' and their 'action', kept in step with the history
+        self._by_type = defaultdict(lambda: deque(maxlen=max_history))
     
     def send_alert(self, action: str, symbol: str, price: float, size: float = None):
         """Send a trading alert to console"""
-        timestamp = self._get_current_time()
-        
-        # Format the message
-        message = f"🚨 {action} ALERT 🚨"
-        details = {
-            "timestamp": timestamp,
-            "action": action,
-            "symbol": symbol,
-            "price": price,
-            "size": size
-        }
+        details = self._alert_details(self._get_current_time(), action, symbol, price, size)
         
         # Store in history
-        self.alerts_history.append(details)
+        self._store_alert(details)
         
         # Print to console
-        print("\n" + "="*50)
-        print(message)
-        print(f"Time: {timestamp}")
-        print(f"Symbol: {symbol}")
-        print(f"Price: ${price:.2f}")
-        if size is not None:
-            print(f"Size: {size:.4f}")
-        print("="*50)
+        self._print_alert(details)
         
         # Log to file if enabled
         if self.log_to_file:
             self._log_to_file(details)
     
+    def send_alerts_bulk(self, records: List[tuple]) -> int:
+        """Send many trading alerts from (action, symbol, price, size) tuples"""
+        # One timestamp for the whole batch; it is only resolved to the second anyway
+        timestamp = self._get_current_time()
+        batch = [self._alert_details(timestamp, *record) for record in records]
+        
+        # Store in history
+        self._store_alerts(batch)
+        
+        # Print to console
+        for details in batch:
+            self._print_alert(details)
+        
+        # Log to file if enabled, opening the log once for the whole batch
+        if self.log_to_file:
+            self._log_to_file(*batch)
+        
+        return len(batch)
+    
     def send_custom_alert(self, message: str):
         """Send a custom message to console"""
         timestamp = self._get_current_time()
@@ -52,7 +63,7 @@ class ConsoleDispatcher:
         }
         
         # Store in history
-        self.alerts_history.append(details)
+        self._store_alert(details)
         
         # Print to console
         print("\n" + "-"*50)
@@ -67,31 +78,62 @@ class ConsoleDispatcher:
     def send_strategy_signal(self, strategy_name: str, signal_type: str, 
                            symbol: str, conditions: List[str] = None):
         """Send strategy signal alert"""
+        details = self._strategy_signal_details(
+            self._get_current_time(), strategy_name, signal_type, symbol, conditions
+        )
+        
+        # Store in history
+        self._store_alert(details)
+        
+        # Print to console
+        self._print_strategy_signal(details)
+        
+        # Log to file if enabled
+        if self.log_to_file:
+            self._log_to_file(details)
+    
+    def send_strategy_signals_bulk(self, records: List[tuple]) -> int:
+        """Send many strategy signals from (strategy, signal, symbol, conditions) tuples"""
+        # One timestamp for the whole batch; it is only resolved to the second anyway
+        timestamp = self._get_current_time()
+        batch = [self._strategy_signal_details(timestamp, *record) for record in records]
+        
+        # Store in history
+        self._store_alerts(batch)
+        
+        # Print to console
+        for details in batch:
+            self._print_strategy_signal(details)
+        
+        # Log to file if enabled, opening the log once for the whole batch
+        if self.log_to_file:
+            self._log_to_file(*batch)
+        
+        return len(batch)
+    
+    def send_structured_alert(self, kind: str, **fields):
+        """Send an alert as raw fields, filed under its kind (e.g. 'pnl')"""
+        reserved = fields.keys() & {"timestamp", "type"}
+        if reserved:
+            raise ValueError(f"Reserved alert fields: {', '.join(sorted(reserved))}")
+        
         timestamp = self._get_current_time()
         
         details = {
             "timestamp": timestamp,
-            "type": "strategy_signal",
-            "strategy": strategy_name,
-            "signal": signal_type,
-            "symbol": symbol,
-            "conditions": conditions or []
+            "type": kind,
+            **fields
         }
         
         # Store in history
-        self.alerts_history.append(details)
+        self._store_alert(details)
         
         # Print to console
-        print("\n" + "⚡"*25)
-        print(f"📊 STRATEGY SIGNAL - {timestamp}")
-        print(f"Strategy: {strategy_name}")
-        print(f"Signal: {signal_type}")
-        print(f"Symbol: {symbol}")
-        if conditions:
-            print("Triggered conditions:")
-            for condition in conditions:
-                print(f"  ✓ {condition}")
-        print("⚡"*25)
+        print("\n" + "-"*50)
+        print(f"📌 {kind.upper()} ALERT - {timestamp}")
+        for name, value in fields.items():
+            print(f"{name.replace('_', ' ').capitalize()}: {value}")
+        print("-"*50)
         
         # Log to file if enabled
         if self.log_to_file:
@@ -110,7 +152,7 @@ class ConsoleDispatcher:
         }
         
         # Store in history
-        self.alerts_history.append(details)
+        self._store_alert(details)
         
         # Print to console
         print("\n" + "❌"*25)
@@ -127,12 +169,11 @@ class ConsoleDispatcher:
     
     def get_alerts_history(self) -> List[dict]:
         """Get all alerts sent during this session"""
-        return self.alerts_history.copy()
+        return list(self.alerts_history)
     
     def get_alerts_by_type(self, alert_type: str) -> List[dict]:
         """Get alerts filtered by type"""
-        return [alert for alert in self.alerts_history 
-                if alert.get('type') == alert_type or alert.get('action') == alert_type]
+        return list(self._by_type.get(alert_type, ()))
     
     def get_alerts_count(self) -> dict:
         """Get count of alerts by type"""
@@ -145,6 +186,7 @@ class ConsoleDispatcher:
     def clear_history(self):
         """Clear alerts history"""
         self.alerts_history.clear()
+        self._by_type.clear()
     
     def test_connection(self) -> bool:
         """Test connection (always returns True for console)"""
@@ -152,15 +194,97 @@ class ConsoleDispatcher:
         print("Connection successful! ✅")
         return True
     
+    def _store_alert(self, details: dict):
+        """Append an alert to the history and the per-type index"""
+        self._make_room(1)
+        self.alerts_history.append(details)
+        for key in self._alert_keys(details):
+            self._by_type[key].append(details)
+    
+    def _store_alerts(self, batch: List[dict]):
+        """Append a batch of alerts to the history and the per-type index"""
+        # Alerts the history would drop straight away must not reach the index either
+        if self.max_history is not None:
+            batch = batch[max(len(batch) - self.max_history, 0):]
+        self._make_room(len(batch))
+        self.alerts_history.extend(batch)
+        for details in batch:
+            for key in self._alert_keys(details):
+                self._by_type[key].append(details)
+    
+    def _make_room(self, count: int):
+        """Drop from the per-type index the alerts the history is about to evict"""
+        if self.max_history is None:
+            return
+        overflow = len(self.alerts_history) + count - self.max_history
+        for evicted in islice(self.alerts_history, max(overflow, 0)):
+            for key in self._alert_keys(evicted):
+                self._by_type[key].popleft()
+    
+    def _alert_keys(self, details: dict) -> set:
+        """Index keys for an alert: its 'type' and its 'action', when present"""
+        return {details.get('type'), details.get('action')} - {None}
+    
+    def _alert_details(self, timestamp: str, action: str, symbol: str,
+                       price: float, size: float = None) -> dict:
+        """Build the history entry for a trading alert"""
+        return {
+            "timestamp": timestamp,
+            "action": action,
+            "symbol": symbol,
+            "price": price,
+            "size": size
+        }
+    
+    def _print_alert(self, details: dict):
+        """Print a trading alert to console"""
+        print("\n" + "="*50)
+        print(f"🚨 {details['action']} ALERT 🚨")
+        print(f"Time: {details['timestamp']}")
+        print(f"Symbol: {details['symbol']}")
+        print(f"Price: ${details['price']:.2f}")
+        if details['size'] is not None:
+            print(f"Size: {details['size']:.4f}")
+        print("="*50)
+    
+    def _strategy_signal_details(self, timestamp: str, strategy_name: str, signal_type: str,
+                                 symbol: str, conditions: List[str] = None) -> dict:
+        """Build the history entry for a strategy signal"""
+        return {
+            "timestamp": timestamp,
+            "type": "strategy_signal",
+            "strategy": strategy_name,
+            "signal": signal_type,
+            "symbol": symbol,
+            "conditions": conditions or []
+        }
+    
+    def _print_strategy_signal(self, details: dict):
+        """Print a strategy signal alert to console"""
+        print("\n" + "⚡"*25)
+        print(f"📊 STRATEGY SIGNAL - {details['timestamp']}")
+        print(f"Strategy: {details['strategy']}")
+        print(f"Signal: {details['signal']}")
+        print(f"Symbol: {details['symbol']}")
+        if details['conditions']:
+            print("Triggered conditions:")
+            for condition in details['conditions']:
+                print(f"  ✓ {condition}")
+        print("⚡"*25)
+    
     def _get_current_time(self) -> str:
         """Get current time as formatted string"""
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    def _log_to_file(self, details: dict):
+    def _log_to_file(self, *entries: dict):
         """Log alert details to file"""
+        lines = [json.dumps(details) + '\n' for details in entries]
         try:
-            with open(self.log_file, 'a') as f:
-                f.write(json.dumps(details) + '\n')
+            if self.log_stream is not None:
+                self.log_stream.writelines(lines)
+            else:
+                with open(self.log_file, 'a') as f:
+                    f.writelines(lines)
         except Exception as e:
             print(f"Warning: Could not write to log file: {e}")
     
@@ -171,7 +295,7 @@ class ConsoleDispatcher:
         
         try:
             with open(filename, 'w') as f:
-                json.dump(self.alerts_history, f, indent=2)
+                json.dump(list(self.alerts_history), f, indent=2)
             print(f"✅ Alerts exported to {filename}")
             return filename
         except Exception as e:
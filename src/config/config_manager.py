@@ -1,23 +1,39 @@
 import yaml
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, TextIO
 from pathlib import Path
 
+# Use the libyaml-backed loader/dumper when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 class ConfigManager:
-    def __init__(self, config_path: Optional[str] = None):
-        if config_path is None:
+    def __init__(self, config_path: Optional[str] = None, stream: Optional[TextIO] = None,
+                 config: Optional[Dict[str, Any]] = None):
+        # An open YAML text stream (e.g. io.StringIO) is read instead of any file,
+        # and an in-memory config dict is used as-is without reading anything
+        if config_path is None and stream is None and config is None:
             # Default to config.yaml in the config directory
             base_dir = Path(__file__).parent.parent.parent
             config_path = os.path.join(base_dir, 'config', 'config.yaml')
         
         self.config_path = config_path
-        self.config = self.load_config()
+        # Dotted key paths split once, e.g. 'telegram.bot_token' -> ('telegram', 'bot_token')
+        self._path_cache: Dict[str, Tuple[str, ...]] = {}
+        self.config = config if config is not None else self.load_config(stream)
+    
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> 'ConfigManager':
+        """Create a manager around an in-memory config without reading any file"""
+        return cls(config=config)
     
-    def load_config(self) -> Dict[str, Any]:
-        """Load configuration from YAML file"""
+    def load_config(self, stream: Optional[TextIO] = None) -> Dict[str, Any]:
+        """Load configuration from YAML file, or from stream if given"""
         try:
+            if stream is not None:
+                return yaml.load(stream, Loader=_YAML_LOADER)
             with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YAML_LOADER)
             return config
         except FileNotFoundError:
             print(f"Config file not found at {self.config_path}. Using defaults.")
@@ -69,23 +85,30 @@ class ConfigManager:
             }
         }
     
-    def save_config(self, config: Optional[Dict[str, Any]] = None):
-        """Save configuration to YAML file"""
+    def save_config(self, config: Optional[Dict[str, Any]] = None, stream: Optional[TextIO] = None):
+        """Save configuration to YAML file, or to stream if given"""
         if config is None:
             config = self.config
         
+        if stream is not None:
+            yaml.dump(config, stream, Dumper=_YAML_DUMPER, default_flow_style=False, sort_keys=False)
+            return
+        
+        if self.config_path is None:
+            raise ValueError("ConfigManager has no config file path; pass a stream to save_config")
+        
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
         
         with open(self.config_path, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(config, f, Dumper=_YAML_DUMPER, default_flow_style=False, sort_keys=False)
     
     def get(self, key_path: str, default: Any = None) -> Any:
         """
         Get configuration value using dot notation
         Example: config.get('telegram.bot_token')
         """
-        keys = key_path.split('.')
+        keys = self._split_key(key_path)
         value = self.config
         
         for key in keys:
@@ -101,7 +124,7 @@ class ConfigManager:
         Set configuration value using dot notation
         Example: config.set('telegram.bot_token', 'your_token')
         """
-        keys = key_path.split('.')
+        keys = self._split_key(key_path)
         
         # Ensure self.config is initialized
         if self.config is None:
@@ -120,6 +143,13 @@ class ConfigManager:
         # Set the value
         config[keys[-1]] = value
     
+    def _split_key(self, key_path: str) -> Tuple[str, ...]:
+        """Split a dotted key path, reusing the result for keys seen before"""
+        keys = self._path_cache.get(key_path)
+        if keys is None:
+            keys = self._path_cache[key_path] = tuple(key_path.split('.'))
+        return keys
+    
     def update_from_dict(self, updates: Dict[str, Any]):
         """Update configuration from a dictionary"""
         def deep_update(d, u):
@@ -289,22 +289,26 @@ INDICATOR_CONFIGS = {
     }
 }
 
+# Indicators grouped by category, built once at import
+_BY_CATEGORY = {}
+for _name, _config in INDICATOR_CONFIGS.items():
+    _BY_CATEGORY.setdefault(_config['category'], {})[_name] = _config
+del _name, _config
+
 def get_indicator_by_category(category):
     """Get all indicators in a specific category"""
-    return {k: v for k, v in INDICATOR_CONFIGS.items() if v['category'] == category}
+    return dict(_BY_CATEGORY.get(category, {}))
 
 def get_indicator_categories():
     """Get all unique indicator categories"""
-    return list(set(ind['category'] for ind in INDICATOR_CONFIGS.values()))
+    return list(_BY_CATEGORY)
 
 def get_indicator_params(indicator_name):
     """Get parameter configuration for a specific indicator"""
-    if indicator_name in INDICATOR_CONFIGS:
-        return INDICATOR_CONFIGS[indicator_name]['params']
-    return {}
+    config = INDICATOR_CONFIGS.get(indicator_name)
+    return config['params'] if config is not None else {}
 
 def get_indicator_lines(indicator_name):
     """Get line names for a specific indicator"""
-    if indicator_name in INDICATOR_CONFIGS:
-        return INDICATOR_CONFIGS[indicator_name]['lines']
-    return []
\ No newline at end of file
+    config = INDICATOR_CONFIGS.get(indicator_name)
+    return config['lines'] if config is not None else []
@@ -1,29 +1,99 @@
-try:
-    import yfinance as yf
-except ImportError:
-    yf = None
-
-try:
-    import ccxt
-except ImportError:
-    ccxt = None
-
 try:
     import pandas as pd
 except ImportError:
     pd = None
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
+import importlib
+import re
+import threading
 import time
 
+def _import_data_source(module: str):
+    """Import yfinance/ccxt on first use; both are slow to import and optional"""
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(f"{module} not installed. Install with: pip install {module}") from None
+
+# Standard intervals to yfinance intervals
+_YF_INTERVALS = {
+    '1m': '1m',
+    '2m': '2m',
+    '5m': '5m',
+    '15m': '15m',
+    '30m': '30m',
+    '60m': '1h',
+    '90m': '90m',
+    '1h': '1h',
+    '1d': '1d',
+    '5d': '5d',
+    '1wk': '1wk',
+    '1mo': '1mo',
+    '3mo': '3mo',
+    # Intervals yfinance lacks: fetch hourly and resample
+    '2h': '1h',
+    '4h': '1h',
+    '6h': '1h',
+    '8h': '1h',
+    '12h': '1h',
+}
+
+# yfinance column names to standard column names
+_YF_COLUMNS = {
+    'Open': 'open',
+    'High': 'high',
+    'Low': 'low',
+    'Close': 'close',
+    'Volume': 'volume',
+    'Adj Close': 'adj_close',
+    'adj close': 'adj_close'
+}
+
+# Characters that can appear in a ticker, e.g. AAPL, BTC-USD, BRK.B, ^GSPC, EURUSD=X,
+# BTC/USDT and ccxt settle-currency symbols such as BTC/USDT:USDT
+_SYMBOL_RE = re.compile(r'^[A-Za-z0-9.\-=^/:]{1,20}$')
+
+# Most yfinance Tickers a fetcher keeps around before dropping the least recently used
+_TICKER_CACHE_SIZE = 256
+
+# Resampling rules for OHLCV columns
+_OHLCV_AGG = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum'
+}
+
+# Interval names to pandas frequency strings
+_RESAMPLE_FREQ = {
+    '2h': '2h',
+    '4h': '4h',
+    '6h': '6h',
+    '8h': '8h',
+    '12h': '12h',
+    '2d': '2D',
+    '3d': '3D',
+    '1w': 'W',
+    '1W': 'W'
+}
+
 class DataFetcher:
     def __init__(self, data_source: str = 'yfinance'):
         self.data_source = data_source
+        # yfinance Tickers by (symbol, worker slot), least recently used first.
+        # Ticker.history keeps per-call state on the instance, so concurrent
+        # fetches each use their own slot and never share a Ticker
+        self._tickers = OrderedDict()
+        self._tickers_lock = threading.Lock()
+        self._ticker_slot = threading.local()
         
         if data_source == 'binance':
-            if ccxt is None:
-                raise ImportError("ccxt not installed. Install with: pip install ccxt")
+            ccxt = _import_data_source('ccxt')
             self.exchange = ccxt.binance({
                 'apiKey': '',
                 'secret': '',
@@ -42,6 +112,69 @@ class DataFetcher:
         else:
             raise ValueError(f"Unsupported data source: {self.data_source}")
     
+    def fetch_many(self, symbols: List[str], interval: str, start_date: str, end_date: str):
+        """
+        Fetch OHLCV data for several symbols on one timeframe
+        
+        yfinance symbols are downloaded in a single batched request; other
+        sources fetch each symbol with fetch_data.
+        
+        Args:
+            symbols: List of trading symbols
+            interval: Timeframe string
+            start_date: Start date string
+            end_date: End date string
+            
+        Returns:
+            Dictionary with symbol as key and DataFrame as value
+        """
+        if self.data_source != 'yfinance':
+            data = {}
+            for symbol in symbols:
+                df = self.fetch_data(symbol, interval, start_date, end_date)
+                if df is not None:
+                    data[symbol] = df
+            return data
+        
+        yf = _import_data_source('yfinance')
+        if pd is None:
+            raise ImportError("pandas not installed. Install with: pip install pandas")
+        if not symbols:
+            return {}
+        
+        try:
+            raw = yf.download(
+                ' '.join(symbols),
+                start=start_date,
+                end=end_date,
+                interval=self._convert_interval_yfinance(interval),
+                group_by='ticker',
+                auto_adjust=True,
+                threads=True,
+                progress=False
+            )
+        except Exception as e:
+            print(f"Error fetching data from Yahoo Finance: {e}")
+            return {}
+        
+        # Columns are (symbol, field) pairs; a single symbol may come back flat
+        grouped = isinstance(raw.columns, pd.MultiIndex)
+        available = set(raw.columns.get_level_values(0)) if grouped else set(symbols)
+        
+        data = {}
+        for symbol in symbols:
+            if symbol not in available:
+                print(f"No data available for {symbol}")
+                continue
+            
+            # Rows are aligned across symbols, so drop the ones this symbol never traded
+            df = raw.xs(symbol, axis=1, level=0) if grouped else raw
+            df = self._standardize_yfinance(df.dropna(how='all'), symbol)
+            if df is not None:
+                data[symbol] = df
+        
+        return data
+    
     def fetch_multiple_timeframes(self, symbol: str, timeframes: List[str], 
                                   start_date: str, end_date: str):
         """
@@ -56,25 +189,52 @@ class DataFetcher:
         Returns:
             Dictionary with timeframe as key and DataFrame as value
         """
-        data = {}
+        if not timeframes:
+            return {}
         
-        for timeframe in timeframes:
-            try:
-                df = self.fetch_data(symbol, timeframe, start_date, end_date)
-                if df is not None and not df.empty:
+        # ccxt exchanges are not thread-safe and their rate limiter assumes
+        # sequential calls, so only Yahoo Finance fetches run concurrently
+        if self.data_source != 'yfinance':
+            data = {}
+            for timeframe in timeframes:
+                df = self._fetch_timeframe(symbol, timeframe, start_date, end_date)
+                if df is not None:
                     data[timeframe] = df
                     # Small delay to avoid rate limits
                     time.sleep(0.1)
-            except Exception as e:
-                print(f"Error fetching {timeframe} data: {e}")
-                continue
+            return data
+        
+        # Yahoo Finance fetches are network-bound, so run them concurrently
+        with ThreadPoolExecutor(max_workers=min(8, len(timeframes))) as executor:
+            futures = {
+                timeframe: executor.submit(self._fetch_timeframe, symbol, timeframe, start_date, end_date, slot)
+                for slot, timeframe in enumerate(timeframes)
+            }
+        
+        # Keep the requested timeframe order and drop failed fetches
+        data = {}
+        for timeframe, future in futures.items():
+            df = future.result()
+            if df is not None:
+                data[timeframe] = df
         
         return data
     
+    def _fetch_timeframe(self, symbol: str, timeframe: str, start_date: str, end_date: str,
+                         slot: int = 0):
+        """Fetch one timeframe for fetch_multiple_timeframes, returning None on failure"""
+        self._ticker_slot.index = slot
+        try:
+            df = self.fetch_data(symbol, timeframe, start_date, end_date)
+            if df is not None and not df.empty:
+                return df
+        except Exception as e:
+            print(f"Error fetching {timeframe} data: {e}")
+        return None
+    
     def _fetch_yfinance_data(self, symbol: str, interval: str, start_date: str, end_date: str):
         """Fetch data from Yahoo Finance"""
-        if yf is None:
-            raise ImportError("yfinance not installed. Install with: pip install yfinance")
+        _import_data_source('yfinance')
         if pd is None:
             raise ImportError("pandas not installed. Install with: pip install pandas")
             
@@ -82,34 +242,37 @@ class DataFetcher:
             # Convert interval to yfinance format
             yf_interval = self._convert_interval_yfinance(interval)
             
-            ticker = yf.Ticker(symbol)
+            ticker = self._get_ticker(symbol)
             df = ticker.history(start=start_date, end=end_date, interval=yf_interval)
             
-            if df.empty:
-                print(f"No data available for {symbol}")
-                return None
-            
-            # Standardize column names
-            df.columns = df.columns.str.lower()
-            df = df.rename(columns={'adj close': 'adj_close'})
-            
-            # Ensure we have required columns
-            required_columns = ['open', 'high', 'low', 'close', 'volume']
-            for col in required_columns:
-                if col not in df.columns:
-                    print(f"Missing required column: {col}")
-                    return None
-            
-            # Remove timezone info and ensure datetime index
-            if df.index.tz is not None:
-                df.index = df.index.tz_localize(None)
-            
-            return df[required_columns]
+            return self._standardize_yfinance(df, symbol)
         
         except Exception as e:
             print(f"Error fetching data from Yahoo Finance: {e}")
             return None
     
+    def _standardize_yfinance(self, df, symbol: str):
+        """Lower-case yfinance columns and keep OHLCV, or return None if unusable"""
+        if df.empty:
+            print(f"No data available for {symbol}")
+            return None
+        
+        # Standardize column names (a label-only rename; no values are copied)
+        df = df.rename(columns=_YF_COLUMNS)
+        
+        # Ensure we have required columns
+        required_columns = ['open', 'high', 'low', 'close', 'volume']
+        for col in required_columns:
+            if col not in df.columns:
+                print(f"Missing required column: {col}")
+                return None
+        
+        # Remove timezone info and ensure datetime index
+        if df.index.tz is not None:
+            df.index = df.index.tz_localize(None)
+        
+        return df[required_columns]
+    
     def _fetch_binance_data(self, symbol: str, interval: str, start_date: str, end_date: str):
         """Fetch data from Binance"""
         try:
@@ -147,37 +310,25 @@ class DataFetcher:
             print(f"Error fetching data from Binance: {e}")
             return None
     
+    def _get_ticker(self, symbol: str):
+        """yfinance Ticker for a symbol, reused so repeat fetches share its HTTP session"""
+        key = (symbol, getattr(self._ticker_slot, 'index', 0))
+        with self._tickers_lock:
+            ticker = self._tickers.get(key)
+            if ticker is not None:
+                self._tickers.move_to_end(key)
+                return ticker
+        
+        ticker = _import_data_source('yfinance').Ticker(symbol)
+        with self._tickers_lock:
+            self._tickers[key] = ticker
+            if len(self._tickers) > _TICKER_CACHE_SIZE:
+                self._tickers.popitem(last=False)
+        return ticker
+    
     def _convert_interval_yfinance(self, interval: str) -> str:
         """Convert standard interval to yfinance format"""
-        interval_map = {
-            '1m': '1m',
-            '2m': '2m',
-            '5m': '5m',
-            '15m': '15m',
-            '30m': '30m',
-            '60m': '1h',
-            '90m': '90m',
-            '1h': '1h',
-            '1d': '1d',
-            '5d': '5d',
-            '1wk': '1wk',
-            '1mo': '1mo',
-            '3mo': '3mo',
-            # Additional mappings
-            '4h': '1h',  # Will need to resample
-            '2h': '1h',  # Will need to resample
-            '6h': '1h',  # Will need to resample
-            '8h': '1h',  # Will need to resample
-            '12h': '1h', # Will need to resample
-        }
-        
-        base_interval = interval_map.get(interval, interval)
-        
-        # For intervals not directly supported, fetch hourly and resample
-        if interval in ['2h', '4h', '6h', '8h', '12h']:
-            return '1h'
-        
-        return base_interval
+        return _YF_INTERVALS.get(interval, interval)
     
     def resample_data(self, df, target_interval: str):
         """
@@ -193,33 +344,20 @@ class DataFetcher:
         if pd is None:
             raise ImportError("pandas not installed. Install with: pip install pandas")
             
+        # Missing OHLCV columns are caught upfront rather than via a pandas error
+        missing = _OHLCV_AGG.keys() - set(df.columns)
+        if missing:
+            print(f"Error resampling data: missing columns {sorted(missing)}")
+            return df
+        
         try:
-            # Define resampling rules
-            agg_dict = {
-                'open': 'first',
-                'high': 'max',
-                'low': 'min',
-                'close': 'last',
-                'volume': 'sum'
-            }
+            if not isinstance(df.index, pd.DatetimeIndex):
+                df = df.set_axis(pd.to_datetime(df.index))
             
-            # Convert interval to pandas frequency
-            freq_map = {
-                '2h': '2H',
-                '4h': '4H',
-                '6h': '6H',
-                '8h': '8H',
-                '12h': '12H',
-                '2d': '2D',
-                '3d': '3D',
-                '1w': 'W',
-                '1W': 'W'
-            }
-            
-            freq = freq_map.get(target_interval, target_interval)
+            freq = _RESAMPLE_FREQ.get(target_interval, target_interval)
             
-            # Resample the data
-            resampled = df.resample(freq).agg(agg_dict)
+            # Resample all columns in one grouped pass
+            resampled = df.resample(freq).agg(_OHLCV_AGG)
             
             # Remove rows with NaN values
             resampled = resampled.dropna()
@@ -234,7 +372,7 @@ class DataFetcher:
         """Get latest price for a symbol"""
         try:
             if self.data_source == 'yfinance':
-                ticker = yf.Ticker(symbol)
+                ticker = self._get_ticker(symbol)
                 data = ticker.history(period='1d', interval='1m')
                 if not data.empty:
                     return float(data['Close'].iloc[-1])
@@ -249,9 +387,13 @@ class DataFetcher:
     
     def validate_symbol(self, symbol: str) -> bool:
         """Validate if symbol exists"""
+        # Malformed symbols can be rejected without a network request
+        if not isinstance(symbol, str) or not _SYMBOL_RE.match(symbol):
+            return False
+        
         try:
             if self.data_source == 'yfinance':
-                ticker = yf.Ticker(symbol)
+                ticker = self._get_ticker(symbol)
                 data = ticker.history(period='1d')
                 return not data.empty
             elif self.data_source == 'binance':
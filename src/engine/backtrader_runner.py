@@ -23,8 +23,8 @@ class BacktraderEngine:
         Returns:
             Dictionary with backtest results
         """
-        # Initialize Cerebro engine
-        self.cerebro = bt.Cerebro()
+        # Initialize Cerebro engine; trade history records each trade's fills
+        self.cerebro = bt.Cerebro(tradehistory=True)
         
         # Add initial cash
         self.cerebro.broker.setcash(self.initial_cash)
@@ -115,20 +115,29 @@ class BacktraderEngine:
         return results
     
     def _extract_trades(self, strategy) -> List[Dict[str, Any]]:
-        """Extract trade information from the strategy"""
+        """Extract trade information from the strategy (needs Cerebro(tradehistory=True))"""
         trades = []
         
-        # Get all completed trades
-        for trade in strategy._trades:
-            if trade.isclosed:
+        # Get all completed trades; backtrader files them by data feed, then trade id
+        all_trades = (
+            trade
+            for trades_by_id in strategy._trades.values()
+            for trades in trades_by_id.values()
+            for trade in trades
+        )
+        for trade in all_trades:
+            if trade.isclosed and trade.history:
+                # A closed trade's size is 0; its largest position and closing fill
+                # are only kept in the trade history
+                size = max((entry.status.size for entry in trade.history), key=abs)
                 trade_info = {
                     'entry_time': bt.num2date(trade.dtopen).strftime('%Y-%m-%d %H:%M:%S'),
                     'exit_time': bt.num2date(trade.dtclose).strftime('%Y-%m-%d %H:%M:%S'),
                     'entry_price': trade.price,
-                    'exit_price': trade.priceclosed,
-                    'size': trade.size,
+                    'exit_price': trade.history[-1].event.price,
+                    'size': size,
                     'pnl': trade.pnl,
-                    'pnl_pct': trade.pnl / (trade.price * abs(trade.size)) * 100,
+                    'pnl_pct': trade.pnl / (trade.price * abs(size)) * 100,
                     'commission': trade.commission
                 }
                 trades.append(trade_info)
@@ -157,8 +166,8 @@ class BacktraderEngine:
         Returns:
             Dictionary with backtest results
         """
-        # Initialize Cerebro engine
-        self.cerebro = bt.Cerebro()
+        # Initialize Cerebro engine; trade history records each trade's fills
+        self.cerebro = bt.Cerebro(tradehistory=True)
         
         # Add initial cash
         self.cerebro.broker.setcash(self.initial_cash)
@@ -267,7 +267,8 @@ class SimpleIndicatorStrategy(bt.Strategy):
                 self.log(f'SELL CREATE, {self.datas[0].close[0]:.2f}')
                 self.order = self.sell()
     
-    def check_condition(self, ind_value, threshold, operator):
+    @staticmethod
+    def check_condition(ind_value, threshold, operator):
         if operator == '>':
             return ind_value > threshold
         elif operator == '<':
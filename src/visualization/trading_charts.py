@@ -8,8 +8,41 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 import json
+from collections import Counter
+from dataclasses import dataclass
+
+# How each OHLCV column combines when bars are merged into a wider bucket
+_OHLCV_AGG = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum'
+}
+
+@dataclass(frozen=True, slots=True)
+class ChartColors:
+    """Professional trading color scheme"""
+    bullish: str = '#00C851'     # Green
+    bearish: str = '#FF4444'     # Red
+    neutral: str = '#33B5E5'     # Blue
+    background: str = '#1E1E1E'  # Dark gray
+    grid: str = '#333333'        # Light gray
+    text: str = '#FFFFFF'        # White
+    volume: str = '#FFB74D'      # Orange
+    ma_fast: str = '#E1BEE7'     # Light purple
+    ma_slow: str = '#FFE082'     # Light yellow
+    rsi: str = '#81C784'         # Light green
+    macd: str = '#90CAF9'        # Light blue
+    
+    def __getitem__(self, name: str) -> str:
+        """Dict-style access (colors['bullish']) for callers of the old colors dict"""
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
 
 class TradingCharts:
     """
@@ -28,22 +61,11 @@ class TradingCharts:
         }
         
         # Professional trading color scheme
-        self.colors = {
-            'bullish': '#00C851',     # Green
-            'bearish': '#FF4444',     # Red
-            'neutral': '#33B5E5',     # Blue
-            'background': '#1E1E1E',  # Dark gray
-            'grid': '#333333',        # Light gray
-            'text': '#FFFFFF',        # White
-            'volume': '#FFB74D',      # Orange
-            'ma_fast': '#E1BEE7',     # Light purple
-            'ma_slow': '#FFE082',     # Light yellow
-            'rsi': '#81C784',         # Light green
-            'macd': '#90CAF9'         # Light blue
-        }
+        self.colors = ChartColors()
     
     def create_candlestick_chart(self, data: pd.DataFrame, symbol: str = "Symbol", 
-                                indicators: Dict = None, trades: List[Dict] = None) -> go.Figure:
+                                indicators: Dict = None, trades: List[Dict] = None,
+                                fast: bool = False, max_bars: int = 2000) -> Union[go.Figure, Dict]:
         """
         Create professional candlestick chart with indicators
         
@@ -52,10 +74,14 @@ class TradingCharts:
             symbol: Symbol name for title
             indicators: Dictionary of indicator data
             trades: List of trade executions to plot
+            fast: Return a plain figure dict without per-trace validation
+            max_bars: Maximum number of candles to draw; longer series are aggregated
             
         Returns:
-            Plotly figure object
+            Plotly figure object, or a {'data', 'layout'} dict when fast is True
         """
+        data, indicators = self._fit_to_pixels(data, max_bars, indicators)
+        
         # Create subplots for main chart and indicators
         subplot_titles = [f"{symbol} Price Action"]
         rows = 1
@@ -82,81 +108,89 @@ class TradingCharts:
             subplot_titles=subplot_titles,
             row_heights=row_heights
         )
+        traces = []
         
-        # Main candlestick chart
-        fig.add_trace(
-            go.Candlestick(
+        # Main candlestick chart - pass only the four OHLC columns as float32
+        # arrays so the serialized figure carries half the bytes per value
+        open_, high, low, close = (
+            data[column].to_numpy(dtype=np.float32) for column in ('open', 'high', 'low', 'close')
+        )
+        traces.append((
+            dict(
+                type='candlestick',
                 x=data.index,
-                open=data['open'],
-                high=data['high'],
-                low=data['low'],
-                close=data['close'],
+                open=open_,
+                high=high,
+                low=low,
+                close=close,
                 name=symbol,
-                increasing_line_color=self.colors['bullish'],
-                decreasing_line_color=self.colors['bearish'],
-                increasing_fillcolor=self.colors['bullish'],
-                decreasing_fillcolor=self.colors['bearish']
+                increasing=dict(line=dict(color=self.colors.bullish), fillcolor=self.colors.bullish),
+                decreasing=dict(line=dict(color=self.colors.bearish), fillcolor=self.colors.bearish)
             ),
-            row=1, col=1
-        )
+            dict(row=1, col=1)
+        ))
         
         current_row = 1
         
         # Add moving averages if available
         if indicators:
             if 'sma_20' in indicators:
-                fig.add_trace(
-                    go.Scatter(
+                traces.append((
+                    dict(
+                        type='scatter',
                         x=data.index,
                         y=indicators['sma_20'],
                         mode='lines',
                         name='SMA 20',
-                        line=dict(color=self.colors['ma_fast'], width=2),
+                        line=dict(color=self.colors.ma_fast, width=2),
                         opacity=0.8
                     ),
-                    row=1, col=1
-                )
+                    dict(row=1, col=1)
+                ))
             
             if 'sma_50' in indicators:
-                fig.add_trace(
-                    go.Scatter(
+                traces.append((
+                    dict(
+                        type='scatter',
                         x=data.index,
                         y=indicators['sma_50'],
                         mode='lines',
                         name='SMA 50',
-                        line=dict(color=self.colors['ma_slow'], width=2),
+                        line=dict(color=self.colors.ma_slow, width=2),
                         opacity=0.8
                     ),
-                    row=1, col=1
-                )
+                    dict(row=1, col=1)
+                ))
             
             # Add Bollinger Bands if available
             if 'bb_upper' in indicators and 'bb_lower' in indicators:
-                fig.add_trace(
-                    go.Scatter(
+                traces.append((
+                    dict(
+                        type='scatter',
                         x=data.index,
                         y=indicators['bb_upper'],
                         mode='lines',
                         name='BB Upper',
-                        line=dict(color=self.colors['neutral'], width=1, dash='dash'),
+                        line=dict(color=self.colors.neutral, width=1, dash='dash'),
                         opacity=0.6
                     ),
-                    row=1, col=1
-                )
+                    dict(row=1, col=1)
+                ))
                 
-                fig.add_trace(
-                    go.Scatter(
+                traces.append((
+                    dict(
+                        type='scatter',
                         x=data.index,
                         y=indicators['bb_lower'],
                         mode='lines',
                         name='BB Lower',
-                        line=dict(color=self.colors['neutral'], width=1, dash='dash'),
+                        line=dict(color=self.colors.neutral, width=1, dash='dash'),
                         fill='tonexty',
                         fillcolor='rgba(51, 181, 229, 0.1)',
                         opacity=0.6
                     ),
-                    row=1, col=1
-                )
+                    dict(row=1, col=1)
+                ))
         
         # Add trade markers if provided
         if trades:
@@ -167,8 +201,9 @@ class TradingCharts:
                 buy_dates = [t['timestamp'] for t in buy_trades]
                 buy_prices = [t['price'] for t in buy_trades]
                 
-                fig.add_trace(
-                    go.Scatter(
+                traces.append((
+                    dict(
+                        type='scatter',
                         x=buy_dates,
                         y=buy_prices,
                         mode='markers',
@@ -176,19 +211,20 @@ class TradingCharts:
                         marker=dict(
                             symbol='triangle-up',
                             size=12,
-                            color=self.colors['bullish'],
+                            color=self.colors.bullish,
                             line=dict(width=2, color='white')
                         )
                     ),
-                    row=1, col=1
-                )
+                    dict(row=1, col=1)
+                ))
             
             if sell_trades:
                 sell_dates = [t['timestamp'] for t in sell_trades]
                 sell_prices = [t['price'] for t in sell_trades]
                 
-                fig.add_trace(
-                    go.Scatter(
+                traces.append((
+                    dict(
+                        type='scatter',
                         x=sell_dates,
                         y=sell_prices,
                         mode='markers',
@@ -196,58 +232,61 @@ class TradingCharts:
                         marker=dict(
                             symbol='triangle-down',
                             size=12,
-                            color=self.colors['bearish'],
+                            color=self.colors.bearish,
                             line=dict(width=2, color='white')
                         )
                     ),
-                    row=1, col=1
-                )
+                    dict(row=1, col=1)
+                ))
         
         # Add volume chart
         if 'volume' in data.columns:
             current_row += 1
             
             # Color volume bars based on price movement
-            volume_colors = []
-            for i in range(len(data)):
-                if i == 0:
-                    volume_colors.append(self.colors['neutral'])
-                else:
-                    if data['close'].iloc[i] >= data['close'].iloc[i-1]:
-                        volume_colors.append(self.colors['bullish'])
-                    else:
-                        volume_colors.append(self.colors['bearish'])
+            close_prices = data['close'].to_numpy()
+            volume_colors = np.where(
+                close_prices[1:] >= close_prices[:-1], self.colors.bullish, self.colors.bearish
+            ).tolist()
+            if len(data):
+                volume_colors.insert(0, self.colors.neutral)
             
-            fig.add_trace(
-                go.Bar(
+            traces.append((
+                dict(
+                    type='bar',
                     x=data.index,
                     y=data['volume'],
                     name='Volume',
-                    marker_color=volume_colors,
+                    marker=dict(color=volume_colors),
                     opacity=0.7
                 ),
-                row=current_row, col=1
-            )
+                dict(row=current_row, col=1)
+            ))
         
         # Add RSI chart
         if indicators and 'rsi' in indicators:
             current_row += 1
             
-            fig.add_trace(
-                go.Scatter(
+            traces.append((
+                dict(
+                    type='scatter',
                     x=data.index,
                     y=indicators['rsi'],
                     mode='lines',
                     name='RSI',
-                    line=dict(color=self.colors['rsi'], width=2)
+                    line=dict(color=self.colors.rsi, width=2)
                 ),
-                row=current_row, col=1
-            )
+                dict(row=current_row, col=1)
+            ))
             
-            # Add RSI overbought/oversold levels
-            fig.add_hline(y=70, line_dash="dash", line_color="red", opacity=0.5, row=current_row, col=1)
-            fig.add_hline(y=30, line_dash="dash", line_color="green", opacity=0.5, row=current_row, col=1)
-            fig.add_hline(y=50, line_dash="dot", line_color="gray", opacity=0.3, row=current_row, col=1)
+            # Add RSI overbought/oversold levels (traces are placed afterwards,
+            # so the RSI row must not be treated as an empty subplot)
+            fig.add_hline(y=70, line_dash="dash", line_color="red", opacity=0.5, row=current_row, col=1,
+                          exclude_empty_subplots=False)
+            fig.add_hline(y=30, line_dash="dash", line_color="green", opacity=0.5, row=current_row, col=1,
+                          exclude_empty_subplots=False)
+            fig.add_hline(y=50, line_dash="dot", line_color="gray", opacity=0.3, row=current_row, col=1,
+                          exclude_empty_subplots=False)
             
             # Update RSI y-axis
             fig.update_yaxes(range=[0, 100], row=current_row, col=1)
@@ -265,13 +304,12 @@ class TradingCharts:
                 xanchor="right",
                 x=1
             ),
-            margin=dict(l=0, r=0, t=40, b=0)
+            margin=dict(l=0, r=0, t=40, b=0),
+            # Remove range slider for cleaner look
+            xaxis_rangeslider_visible=False
         )
         
-        # Remove range slider for cleaner look
-        fig.update_layout(xaxis_rangeslider_visible=False)
-        
-        return fig
+        return self._place_traces(fig, traces, fast)
     
     def create_performance_dashboard(self, backtest_results: Dict) -> go.Figure:
         """
@@ -283,22 +321,23 @@ class TradingCharts:
         Returns:
             Plotly figure with performance metrics
         """
+        # Only lay out the sections that actually have data
+        sections = {
+            'portfolio_value': ("Portfolio Value Over Time", {"secondary_y": False}),
+            'trades': ("Trade Distribution", {"type": "bar"}),
+            'monthly_returns': ("Monthly Returns", {"type": "bar"}),
+            'drawdown': ("Drawdown Analysis", {"secondary_y": False})
+        }
+        sections = {key: section for key, section in sections.items() if key in backtest_results}
+        
+        if not sections:
+            return self._create_empty_figure("Performance Dashboard", "No backtest results available")
+        
         # Create subplot layout
-        fig = make_subplots(
-            rows=2,
-            cols=2,
-            subplot_titles=[
-                "Portfolio Value Over Time",
-                "Trade Distribution",
-                "Monthly Returns",
-                "Drawdown Analysis"
-            ],
-            specs=[[{"secondary_y": False}, {"type": "bar"}],
-                   [{"type": "bar"}, {"secondary_y": False}]]
-        )
+        fig, cells = self._create_section_grid(sections)
         
         # 1. Portfolio value over time
-        if 'portfolio_value' in backtest_results:
+        if 'portfolio_value' in sections:
             portfolio_data = backtest_results['portfolio_value']
             fig.add_trace(
                 go.Scatter(
@@ -306,14 +345,14 @@ class TradingCharts:
                     y=portfolio_data.values,
                     mode='lines',
                     name='Portfolio Value',
-                    line=dict(color=self.colors['bullish'], width=2),
+                    line=dict(color=self.colors.bullish, width=2),
                     fill='tonexty'
                 ),
-                row=1, col=1
+                **cells['portfolio_value']
             )
         
         # 2. Trade distribution (wins vs losses)
-        if 'trades' in backtest_results:
+        if 'trades' in sections:
             trades = backtest_results['trades']
             wins = len([t for t in trades if t.get('pnl', 0) > 0])
             losses = len([t for t in trades if t.get('pnl', 0) < 0])
@@ -323,15 +362,17 @@ class TradingCharts:
                     x=['Winning Trades', 'Losing Trades'],
                     y=[wins, losses],
                     name='Trade Distribution',
-                    marker_color=[self.colors['bullish'], self.colors['bearish']]
+                    marker_color=[self.colors.bullish, self.colors.bearish]
                 ),
-                row=1, col=2
+                **cells['trades']
             )
         
         # 3. Monthly returns
-        if 'monthly_returns' in backtest_results:
+        if 'monthly_returns' in sections:
             monthly_returns = backtest_results['monthly_returns']
-            colors = [self.colors['bullish'] if x >= 0 else self.colors['bearish'] for x in monthly_returns.values]
+            colors = np.where(
+                monthly_returns.to_numpy() >= 0, self.colors.bullish, self.colors.bearish
+            ).tolist()
             
             fig.add_trace(
                 go.Bar(
@@ -340,11 +381,11 @@ class TradingCharts:
                     name='Monthly Returns',
                     marker_color=colors
                 ),
-                row=2, col=1
+                **cells['monthly_returns']
             )
         
         # 4. Drawdown analysis
-        if 'drawdown' in backtest_results:
+        if 'drawdown' in sections:
             drawdown = backtest_results['drawdown']
             fig.add_trace(
                 go.Scatter(
@@ -352,18 +393,18 @@ class TradingCharts:
                     y=drawdown.values,
                     mode='lines',
                     name='Drawdown',
-                    line=dict(color=self.colors['bearish'], width=2),
+                    line=dict(color=self.colors.bearish, width=2),
                     fill='tozeroy',
                     fillcolor='rgba(255, 68, 68, 0.3)'
                 ),
-                row=2, col=2
+                **cells['drawdown']
             )
         
         # Update layout
         fig.update_layout(
             title="Performance Dashboard",
             template="plotly_dark",
-            height=600,
+            height=300 * ((len(sections) + 1) // 2),
             showlegend=False
         )
         
@@ -420,7 +461,7 @@ class TradingCharts:
             theta=categories,
             fill='toself',
             name='Risk Metrics',
-            line_color=self.colors['neutral']
+            line_color=self.colors.neutral
         ))
         
         fig.update_layout(
@@ -437,13 +478,14 @@ class TradingCharts:
         return fig
     
     def create_multi_timeframe_analysis(self, data_dict: Dict[str, pd.DataFrame], 
-                                      symbol: str = "Symbol") -> go.Figure:
+                                      symbol: str = "Symbol", max_bars: int = 2000) -> go.Figure:
         """
         Create multi-timeframe analysis chart
         
         Args:
             data_dict: Dictionary with timeframes as keys and OHLCV data as values
             symbol: Symbol name
+            max_bars: Maximum number of candles to draw per timeframe
             
         Returns:
             Plotly figure with multiple timeframes
@@ -460,6 +502,8 @@ class TradingCharts:
         )
         
         for i, (timeframe, data) in enumerate(data_dict.items(), 1):
+            data, _ = self._fit_to_pixels(data, max_bars)
+            
             # Add candlestick for each timeframe
             fig.add_trace(
                 go.Candlestick(
@@ -469,58 +513,66 @@ class TradingCharts:
                     low=data['low'],
                     close=data['close'],
                     name=f"{timeframe}",
-                    increasing_line_color=self.colors['bullish'],
-                    decreasing_line_color=self.colors['bearish']
+                    increasing_line_color=self.colors.bullish,
+                    decreasing_line_color=self.colors.bearish
                 ),
                 row=i, col=1
             )
         
+        # Remove range sliders except for the bottom chart, in the same
+        # update_layout call so the layout is only validated once
+        rangeslider_off = {f'xaxis{i}_rangeslider_visible': False for i in range(1, rows)}
+        
         fig.update_layout(
             title=f"{symbol} - Multi-Timeframe Analysis",
             template="plotly_dark",
             height=200 * rows,
-            showlegend=False
+            showlegend=False,
+            **rangeslider_off
         )
         
-        # Remove range sliders except for the bottom chart
-        for i in range(1, rows):
-            fig.update_layout(**{f'xaxis{i}_rangeslider_visible': False})
-        
         return fig
     
-    def create_live_dashboard(self, current_data: Dict, alerts: List[Dict]) -> go.Figure:
+    def create_live_dashboard(self, current_data: Dict, alerts: List[Dict],
+                              fast: bool = False) -> Union[go.Figure, Dict]:
         """
         Create live trading dashboard
         
         Args:
             current_data: Current market data
             alerts: Recent alerts
+            fast: Return a plain figure dict without per-trace validation
             
         Returns:
-            Plotly figure for live dashboard
+            Plotly figure for live dashboard, or a {'data', 'layout'} dict when fast is True
         """
-        # Create 2x2 subplot layout
-        fig = make_subplots(
-            rows=2,
-            cols=2,
-            subplot_titles=[
-                "Current Price Movement",
-                "Alert Distribution",
-                "Volume Analysis", 
-                "Recent Signals"
-            ],
-            specs=[[{"type": "indicator"}, {"type": "pie"}],
-                   [{"type": "bar"}, {"type": "scatter"}]]
-        )
+        recent_signals = [a for a in alerts if a.get('type') == 'signal'][-10:] if alerts else []  # Last 10 signals
+        
+        # Only lay out the sections that actually have data
+        sections = {
+            'current_price': ("Current Price Movement", {"type": "indicator"}, 'current_price' in current_data),
+            'alert_types': ("Alert Distribution", {"type": "pie"}, bool(alerts)),
+            'volume_data': ("Volume Analysis", {"type": "bar"}, 'volume_data' in current_data),
+            'recent_signals': ("Recent Signals", {"type": "scatter"}, bool(recent_signals))
+        }
+        sections = {key: (title, spec) for key, (title, spec, has_data) in sections.items() if has_data}
+        
+        if not sections:
+            return self._create_empty_figure("Live Trading Dashboard", "No live data available", fast)
+        
+        # Create subplot layout
+        fig, cells = self._create_section_grid(sections)
+        traces = []
         
         # 1. Current price indicator
-        if 'current_price' in current_data:
+        if 'current_price' in sections:
             price = current_data['current_price']
             change = current_data.get('price_change', 0)
             change_pct = current_data.get('price_change_percent', 0)
             
-            fig.add_trace(
-                go.Indicator(
+            traces.append((
+                dict(
+                    type='indicator',
                     mode="number+delta",
                     value=price,
                     delta={'reference': price - change, 'relative': True},
@@ -528,66 +580,198 @@ class TradingCharts:
                     number={'prefix': "$"},
                     domain={'x': [0, 1], 'y': [0, 1]}
                 ),
-                row=1, col=1
-            )
+                cells['current_price']
+            ))
         
         # 2. Alert distribution pie chart
-        if alerts:
-            alert_types = {}
-            for alert in alerts:
-                alert_type = alert.get('type', 'unknown')
-                alert_types[alert_type] = alert_types.get(alert_type, 0) + 1
+        if 'alert_types' in sections:
+            alert_types = Counter(alert.get('type', 'unknown') for alert in alerts)
             
-            fig.add_trace(
-                go.Pie(
+            traces.append((
+                dict(
+                    type='pie',
                     labels=list(alert_types.keys()),
                     values=list(alert_types.values()),
                     name="Alert Types"
                 ),
-                row=1, col=2
-            )
+                cells['alert_types']
+            ))
         
         # 3. Volume analysis
-        if 'volume_data' in current_data:
+        if 'volume_data' in sections:
             volume_data = current_data['volume_data']
-            fig.add_trace(
-                go.Bar(
+            traces.append((
+                dict(
+                    type='bar',
                     x=volume_data.index,
                     y=volume_data.values,
                     name="Volume",
-                    marker_color=self.colors['volume']
+                    marker=dict(color=self.colors.volume)
                 ),
-                row=2, col=1
-            )
+                cells['volume_data']
+            ))
         
         # 4. Recent signals
-        if alerts:
-            recent_signals = [a for a in alerts if a.get('type') == 'signal'][-10:]  # Last 10 signals
-            if recent_signals:
-                x_vals = [s.get('timestamp', '') for s in recent_signals]
-                y_vals = [s.get('price', 0) for s in recent_signals]
-                colors = [self.colors['bullish'] if s.get('action') == 'BUY' else self.colors['bearish'] 
-                         for s in recent_signals]
-                
-                fig.add_trace(
-                    go.Scatter(
-                        x=x_vals,
-                        y=y_vals,
-                        mode='markers+lines',
-                        name="Recent Signals",
-                        marker=dict(color=colors, size=8),
-                        line=dict(color=self.colors['neutral'])
-                    ),
-                    row=2, col=2
-                )
+        if 'recent_signals' in sections:
+            x_vals = [s.get('timestamp', '') for s in recent_signals]
+            y_vals = [s.get('price', 0) for s in recent_signals]
+            colors = [self.colors.bullish if s.get('action') == 'BUY' else self.colors.bearish 
+                     for s in recent_signals]
+            
+            traces.append((
+                dict(
+                    type='scattergl',
+                    x=x_vals,
+                    y=y_vals,
+                    mode='markers+lines',
+                    name="Recent Signals",
+                    marker=dict(color=colors, size=8),
+                    line=dict(color=self.colors.neutral)
+                ),
+                cells['recent_signals']
+            ))
         
         fig.update_layout(
             title="Live Trading Dashboard",
             template="plotly_dark",
-            height=600
+            height=300 * ((len(sections) + 1) // 2),
+            # Keep zoom/scale state between refreshes so the client can reuse
+            # the existing WebGL scene instead of rebuilding it every tick
+            uirevision='live'
         )
         
-        return fig
+        return self._place_traces(fig, traces, fast)
+    
+    def _fit_to_pixels(self, data: pd.DataFrame, max_bars: int = 2000,
+                       indicators: Dict = None) -> Tuple[pd.DataFrame, Optional[Dict]]:
+        """
+        Aggregate OHLCV bars into at most max_bars time buckets
+        
+        A chart only has a couple of thousand pixels across, so drawing more
+        candles than that only adds geometry the browser cannot show.
+        
+        Args:
+            data: OHLCV data with datetime index
+            max_bars: Maximum number of bars to keep (at least 2)
+            indicators: Optional indicator series aligned with data
+            
+        Returns:
+            Tuple of (aggregated data, indicators aligned with the aggregated index)
+        """
+        if max_bars < 2:
+            raise ValueError(f"max_bars must be at least 2, got {max_bars}")
+        
+        if len(data) <= max_bars or not isinstance(data.index, pd.DatetimeIndex):
+            return data, indicators
+        
+        # Bars that all share one timestamp have no time span to bucket
+        span = data.index[-1] - data.index[0]
+        if span <= pd.Timedelta(0):
+            return data, indicators
+        
+        rule = (span / (max_bars - 1)).ceil('s')
+        aggregation = {column: how for column, how in _OHLCV_AGG.items() if column in data.columns}
+        
+        fitted = data.resample(rule, origin='start').agg(aggregation).dropna(subset=['close'])
+        
+        if indicators:
+            indicators = {
+                name: pd.Series(np.asarray(values), index=data.index)
+                      .resample(rule, origin='start').last()
+                      .reindex(fitted.index)
+                for name, values in indicators.items()
+            }
+        
+        return fitted, indicators
+    
+    def _place_traces(self, fig: go.Figure, traces: List[Tuple[Dict, Dict]],
+                      fast: bool = False) -> Union[go.Figure, Dict]:
+        """
+        Place trace specs into the subplot grid of a figure
+        
+        Args:
+            fig: Figure holding the subplot grid and finished layout
+            traces: List of (trace dict, row/col keyword arguments) pairs
+            fast: Skip trace validation and return a plain figure dict
+            
+        Returns:
+            The populated figure, or a {'data', 'layout'} dict when fast is True
+        """
+        if not fast:
+            for trace, cell in traces:
+                fig.add_trace(trace, **cell)
+            return fig
+        
+        # Point each raw trace at its subplot's axes (or domain) by hand so
+        # Plotly never has to build and validate the trace objects
+        data = []
+        for trace, cell in traces:
+            subplot = fig.get_subplot(**cell)
+            if hasattr(subplot, 'xaxis'):
+                trace = dict(
+                    trace,
+                    xaxis=subplot.xaxis.plotly_name.replace('axis', ''),
+                    yaxis=subplot.yaxis.plotly_name.replace('axis', '')
+                )
+            else:
+                trace = dict(trace, domain={'x': list(subplot.x), 'y': list(subplot.y)})
+            data.append(trace)
+        
+        return {'data': data, 'layout': fig.layout.to_plotly_json()}
+    
+    def _create_section_grid(self, sections: Dict[str, Tuple[str, Dict]]) -> Tuple[go.Figure, Dict[str, Dict]]:
+        """
+        Create a subplot grid sized to the populated dashboard sections
+        
+        Args:
+            sections: Ordered mapping of section key to (subplot title, subplot spec)
+            
+        Returns:
+            Tuple of (figure, mapping of section key to its row/col keyword arguments)
+        """
+        cols = min(2, len(sections))
+        rows = (len(sections) + 1) // 2
+        
+        specs = [[None] * cols for _ in range(rows)]
+        cells = {}
+        for i, (key, (_, spec)) in enumerate(sections.items()):
+            row, col = divmod(i, cols)
+            specs[row][col] = spec
+            cells[key] = {'row': row + 1, 'col': col + 1}
+        
+        fig = make_subplots(
+            rows=rows,
+            cols=cols,
+            subplot_titles=[title for title, _ in sections.values()],
+            specs=specs
+        )
+        
+        return fig, cells
+    
+    def _create_empty_figure(self, title: str, message: str,
+                             fast: bool = False) -> Union[go.Figure, Dict]:
+        """
+        Create a placeholder figure for dashboards without any data
+        
+        Args:
+            title: Figure title
+            message: Message shown in the middle of the figure
+            fast: Return a plain figure dict, as the fast dashboards do
+            
+        Returns:
+            Plotly figure with a single annotation, or a {'data', 'layout'} dict when fast is True
+        """
+        fig = go.Figure()
+        fig.update_layout(
+            title=title,
+            template="plotly_dark",
+            height=300,
+            xaxis_visible=False,
+            yaxis_visible=False,
+            annotations=[dict(text=message, showarrow=False, font=dict(size=16))]
+        )
+        
+        return self._place_traces(fig, [], fast)
 
 def create_sample_chart(symbol: str = "BTC-USD") -> go.Figure:
     """
@@ -599,41 +783,30 @@ def create_sample_chart(symbol: str = "BTC-USD") -> go.Figure:
     Returns:
         Sample Plotly figure
     """
-    # Generate sample data
-    dates = pd.date_range(start='2023-01-01', end='2023-12-31', freq='D')
+    # Generate sample data - one calendar day per bar for 2023
+    n = 365
+    dates = np.datetime64('2023-01-01') + np.arange(n, dtype='timedelta64[D]')
     np.random.seed(42)
     
-    # Generate realistic price movement
-    price = 100
-    prices = []
-    volumes = []
+    # Generate realistic price movement: random walk with slight upward bias,
+    # where each bar opens at the previous close moved by `change`
+    change = np.random.normal(0.001, 0.02, n)
+    high_factor = np.random.uniform(1.0, 1.02, n)
+    low_factor = np.random.uniform(0.98, 1.0, n)
+    close_factor = np.random.uniform(0.99, 1.01, n)
     
-    for i in range(len(dates)):
-        # Random walk with slight upward bias
-        change = np.random.normal(0.001, 0.02)
-        price *= (1 + change)
-        
-        # OHLC data
-        open_price = price
-        high_price = price * np.random.uniform(1.0, 1.02)
-        low_price = price * np.random.uniform(0.98, 1.0)
-        close_price = price * np.random.uniform(0.99, 1.01)
-        
-        prices.append({
-            'open': open_price,
-            'high': max(high_price, open_price, close_price),
-            'low': min(low_price, open_price, close_price),
-            'close': close_price
-        })
-        
-        # Random volume
-        volumes.append(np.random.uniform(1000000, 5000000))
-        
-        price = close_price
+    close_prices = 100 * np.cumprod((1 + change) * close_factor)
+    open_prices = close_prices / close_factor
     
     # Create DataFrame
-    df = pd.DataFrame(prices, index=dates)
-    df['volume'] = volumes
+    df = pd.DataFrame({
+        'open': open_prices,
+        'high': np.maximum.reduce([open_prices * high_factor, open_prices, close_prices]),
+        'low': np.minimum.reduce([open_prices * low_factor, open_prices, close_prices]),
+        'close': close_prices,
+        # Random volume
+        'volume': np.random.uniform(1000000, 5000000, n)
+    }, index=pd.DatetimeIndex(dates))
     
     # Add some indicators
     df['sma_20'] = df['close'].rolling(20).mean()
@@ -0,0 +1,64 @@
+"""
+Indicator helpers shared by the integration test fixtures
+"""
+import math
+
+import pandas as pd
+import numpy as np
+
+def pad_window(values, window):
+    """Left-pad a per-window result with NaN so it lines up with the source rows"""
+    return np.concatenate([np.full(window - 1, np.nan), values])
+
+def pct_change(values):
+    """Bar-over-bar fractional change, NaN for the first bar"""
+    return pad_window(np.diff(values) / values[:-1], 2)
+
+def rolling_mean_std(values, window):
+    """Trailing-window mean and sample std (ddof=1), NaN until the first window is full"""
+    values = np.asarray(values, dtype=float)
+    mean = np.full(len(values), np.nan)
+    std = np.full(len(values), np.nan)
+    if len(values) < window:
+        return mean, std
+
+    # Welford's update on the first window, then slide it one bar at a time by
+    # adding the new value and removing the oldest; every step works on
+    # deviations from the current mean, so no large running sums cancel out
+    avg, m2 = 0.0, 0.0
+    for count, x in enumerate(values[:window], 1):
+        delta = x - avg
+        avg += delta / count
+        m2 += delta * (x - avg)
+    mean[window - 1], std[window - 1] = avg, math.sqrt(max(m2, 0.0) / (window - 1))
+
+    for i in range(window, len(values)):
+        new, old = values[i], values[i - window]
+        prev_avg = avg
+        avg += (new - old) / window
+        m2 = max(m2 + (new - old) * (new - avg + old - prev_avg), 0.0)
+        mean[i], std[i] = avg, math.sqrt(m2 / (window - 1))
+    return mean, std
+
+def rolling_mean(values, window):
+    """Trailing-window mean, NaN until the first window is full"""
+    return rolling_mean_std(values, window)[0]
+
+def wilder_rsi(close, period=14):
+    """RSI with Wilder smoothing, seeded with the simple mean of the first period moves"""
+    delta = np.diff(close)
+    rsi = np.full(len(close), np.nan)
+    if len(delta) < period:
+        return rsi
+
+    # Wilder's recursion avg = avg*(period-1)/period + x/period is an EWM with alpha=1/period
+    def smooth(moves):
+        seeded = moves[period - 1:].copy()
+        seeded[0] = moves[:period].mean()
+        return pd.Series(seeded).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+
+    avg_gain = smooth(np.clip(delta, 0, None))
+    avg_loss = smooth(np.clip(-delta, 0, None))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi[period:] = 100 - (100 / (1 + avg_gain / avg_loss))
+    return rsi
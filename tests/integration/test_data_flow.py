@@ -3,8 +3,12 @@
 Integration tests for data flow through the system
 """
 import unittest
+import functools
+import importlib.util
 import sys
 import os
+import tempfile
+import yaml
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -13,44 +17,64 @@ from unittest.mock import Mock, patch
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'src'))
 
+from src.config.config_manager import ConfigManager
+from src.data.fetcher import DataFetcher
+from src.alerts.console_dispatcher import ConsoleDispatcher
+
+HAS_YFINANCE = importlib.util.find_spec('yfinance') is not None
+
+OHLCV_COLUMNS = frozenset({'open', 'high', 'low', 'close', 'volume'})
+
+SAMPLE_DATES = pd.date_range('2023-01-01', periods=100, freq='D')
+
+@functools.lru_cache(maxsize=None)
+def make_sample_ohlcv():
+    """Build the sample OHLCV frame once per test run; callers must not mutate it"""
+    # Create realistic sample data
+    dates = SAMPLE_DATES
+    rng = np.random.default_rng(42)  # Reproducible results
+    n = len(dates)
+    
+    base_price = 100
+    changes = rng.normal(0.02, 2.0, n)
+    close = base_price * np.cumprod(1 + changes / 100)
+    
+    # Half-normal wick sizes, computed in place
+    high_noise = rng.standard_normal(n)
+    np.abs(high_noise, out=high_noise)
+    high_noise *= 0.01
+    low_noise = rng.standard_normal(n)
+    np.abs(low_noise, out=low_noise)
+    low_noise *= 0.01
+    
+    high = close * (1 + high_noise)
+    low = close * (1 - low_noise)
+    open_price = close * (1 + rng.normal(0, 0.005, n))
+    volume = np.abs(rng.normal(1000000, 200000, n))
+    
+    return pd.DataFrame({
+        'open': open_price,
+        'high': np.maximum.reduce([high, open_price, close]),
+        'low': np.minimum.reduce([low, open_price, close]),
+        'close': close,
+        'volume': volume
+    }, index=dates)
+
 class TestDataFlow(unittest.TestCase):
     """Test data flow from fetching to processing"""
     
-    def setUp(self):
-        """Set up test data and mocks"""
-        # Create realistic sample data
-        dates = pd.date_range('2023-01-01', periods=100, freq='D')
-        np.random.seed(42)  # Reproducible results
-        
-        base_price = 100
-        prices = []
-        current_price = base_price
-        
-        for _ in range(len(dates)):
-            change = np.random.normal(0.02, 2.0)
-            current_price *= (1 + change / 100)
-            
-            high = current_price * (1 + abs(np.random.normal(0, 0.01)))
-            low = current_price * (1 - abs(np.random.normal(0, 0.01)))
-            open_price = current_price * (1 + np.random.normal(0, 0.005))
-            volume = abs(np.random.normal(1000000, 200000))
-            
-            prices.append({
-                'open': open_price,
-                'high': max(high, open_price, current_price),
-                'low': min(low, open_price, current_price),
-                'close': current_price,
-                'volume': volume
-            })
-        
-        self.sample_data = pd.DataFrame(prices, index=dates)
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data shared (read-only) by every test"""
+        cls.sample_data = make_sample_ohlcv()
+        
+        # Shared dispatcher; tests that send alerts clear its history on cleanup
+        cls.dispatcher = ConsoleDispatcher()
     
     def test_config_to_strategy_flow(self):
         """Test configuration flows correctly to strategy parameters"""
         print("\n🔧 Testing: Config → Strategy Flow")
         
-        from src.config.config_manager import ConfigManager
-        
         # Create config with strategy parameters
         config = ConfigManager()
         config.set('strategies.rsi_crossover.rsi_period', 21)
@@ -68,8 +92,6 @@ class TestDataFlow(unittest.TestCase):
         """Test data flows from fetcher to engine"""
         print("\n📊 Testing: Data Fetcher → Engine Flow")
         
-        from src.data.fetcher import DataFetcher
-        
         # Test data processing pipeline
         fetcher = DataFetcher('yfinance')
         
@@ -78,15 +100,11 @@ class TestDataFlow(unittest.TestCase):
         assert converted_interval == '1h', "Interval conversion failed"
         
         # Test data validation
-        assert 'open' in self.sample_data.columns
-        assert 'high' in self.sample_data.columns
-        assert 'low' in self.sample_data.columns
-        assert 'close' in self.sample_data.columns
-        assert 'volume' in self.sample_data.columns
+        assert OHLCV_COLUMNS.issubset(frozenset(self.sample_data.columns))
         
         # Test data integrity
         assert len(self.sample_data) > 0
-        assert not self.sample_data.isnull().any().any()
+        assert not np.isnan(self.sample_data.to_numpy()).any()
         
         print("✅ Data flows correctly from fetcher to engine")
     
@@ -94,18 +112,12 @@ class TestDataFlow(unittest.TestCase):
         """Test multi-timeframe data processing"""
         print("\n⏰ Testing: Multi-Timeframe Data Flow")
         
-        from src.data.fetcher import DataFetcher
-        
         fetcher = DataFetcher('yfinance')
         
-        # Create different timeframe data
-        hourly_data = self.sample_data.copy()
-        daily_data = self.sample_data.copy()
-        
-        # Simulate timeframe data processing
+        # Simulate timeframe data processing (read-only, so share the fixture)
         timeframe_data = {
-            '1h': hourly_data,
-            '1d': daily_data
+            '1h': self.sample_data,
+            '1d': self.sample_data
         }
         
         # Test data consistency across timeframes
@@ -116,13 +128,12 @@ class TestDataFlow(unittest.TestCase):
         
         print("✅ Multi-timeframe data flows correctly")
     
+    @unittest.skipUnless(HAS_YFINANCE, "yfinance not installed")
     @patch('yfinance.Ticker')
     def test_real_data_fetch_simulation(self, mock_ticker):
         """Test simulated real data fetching"""
         print("\n🌐 Testing: Real Data Fetch Simulation")
         
-        from src.data.fetcher import DataFetcher
-        
         # Mock yfinance response
         mock_instance = Mock()
         mock_instance.history.return_value = self.sample_data
@@ -130,20 +141,13 @@ class TestDataFlow(unittest.TestCase):
         
         fetcher = DataFetcher('yfinance')
         
-        try:
-            # This will fail without yfinance, but we can test the flow
-            result = fetcher.fetch_data('AAPL', '1d', '2023-01-01', '2023-12-31')
-            
-            if result is not None:
-                assert isinstance(result, pd.DataFrame)
-                print("✅ Real data fetch simulation successful")
-            else:
-                print("⚠️ Data fetch returned None (expected without yfinance)")
-        except ImportError:
-            print("⚠️ yfinance not available - testing flow structure only")
-            # Test that the method exists and has correct signature
-            assert hasattr(fetcher, 'fetch_data')
-            assert hasattr(fetcher, '_convert_interval_yfinance')
+        result = fetcher.fetch_data('AAPL', '1d', '2023-01-01', '2023-12-31')
+        
+        if result is not None:
+            assert isinstance(result, pd.DataFrame)
+            print("✅ Real data fetch simulation successful")
+        else:
+            print("⚠️ Data fetch returned None")
     
     def test_data_validation_flow(self):
         """Test data validation throughout the pipeline"""
@@ -158,19 +162,19 @@ class TestDataFlow(unittest.TestCase):
             assert col in valid_data.columns, f"Missing required column: {col}"
         
         # Check data types
-        for col in required_columns:
-            assert pd.api.types.is_numeric_dtype(valid_data[col]), f"Column {col} is not numeric"
+        kinds = np.array([dtype.kind for dtype in valid_data[required_columns].dtypes])
+        assert np.isin(kinds, list('fiu')).all(), f"Non-numeric columns: {valid_data[required_columns].dtypes.to_dict()}"
         
         # Check OHLC logic
-        assert (valid_data['high'] >= valid_data['low']).all(), "High < Low found"
-        assert (valid_data['high'] >= valid_data['open']).all(), "High < Open found"
-        assert (valid_data['high'] >= valid_data['close']).all(), "High < Close found"
-        assert (valid_data['low'] <= valid_data['open']).all(), "Low > Open found"
-        assert (valid_data['low'] <= valid_data['close']).all(), "Low > Close found"
+        open_, high, low, close = valid_data[['open', 'high', 'low', 'close']].to_numpy(copy=False).T
+        assert np.all((high >= low) & (high >= open_) & (high >= close) & (low <= open_) & (low <= close)), \
+            "OHLC relationship violated (High/Low outside Open/Close range)"
         
         # Test invalid data detection
         invalid_data = valid_data.copy()
-        invalid_data.iloc[0, invalid_data.columns.get_loc('high')] = invalid_data.iloc[0, invalid_data.columns.get_loc('low')] - 1  # Invalid: high < low
+        high_loc = invalid_data.columns.get_loc('high')
+        low_loc = invalid_data.columns.get_loc('low')
+        invalid_data.iat[0, high_loc] = invalid_data.iat[0, low_loc] - 1  # Invalid: high < low
         
         # This should be detected by validation
         has_invalid = (invalid_data['high'] < invalid_data['low']).any()
@@ -182,10 +186,6 @@ class TestDataFlow(unittest.TestCase):
         """Test configuration file loads and flows to runtime"""
         print("\n⚙️ Testing: Config File → Runtime Flow")
         
-        from src.config.config_manager import ConfigManager
-        import tempfile
-        import yaml
-        
         # Create test config
         test_config = {
             'trading': {
@@ -206,7 +206,7 @@ class TestDataFlow(unittest.TestCase):
         
         # Create temporary config file
         with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(test_config, f)
+            yaml.dump(test_config, f, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper))
             temp_path = f.name
         
         try:
@@ -224,26 +224,19 @@ class TestDataFlow(unittest.TestCase):
         finally:
             os.unlink(temp_path)
     
+    @unittest.skipUnless(HAS_YFINANCE, "yfinance not installed")
     def test_error_propagation_flow(self):
         """Test error handling flows through the system"""
         print("\n🚨 Testing: Error Propagation Flow")
         
-        from src.data.fetcher import DataFetcher
-        from src.alerts.console_dispatcher import ConsoleDispatcher
-        
         # Test error handling in data fetcher
         fetcher = DataFetcher('yfinance')
-        dispatcher = ConsoleDispatcher()
+        dispatcher = self.dispatcher
+        self.addCleanup(dispatcher.clear_history)
         
-        # Test invalid symbol handling
-        try:
-            # This should handle errors gracefully
-            result = fetcher.fetch_data('INVALID_SYMBOL_XYZ', '1d', '2023-01-01', '2023-01-31')
-            # Should return None or raise ImportError for missing dependencies
-            assert result is None or isinstance(result, type(None))
-        except ImportError:
-            # Expected when dependencies not available
-            pass
+        # Test invalid symbol handling - this should handle errors gracefully
+        result = fetcher.fetch_data('INVALID_SYMBOL_XYZ', '1d', '2023-01-01', '2023-01-31')
+        assert result is None
         
         # Test error alert
         dispatcher.send_error_alert(
@@ -266,21 +259,21 @@ class TestDataIntegrity(unittest.TestCase):
         print("\n🔍 Testing: Data Consistency")
         
         # Create test data
-        dates = pd.date_range('2023-01-01', periods=50, freq='D')
+        dates = SAMPLE_DATES[:50]
+        rng = np.random.default_rng(42)
         test_data = pd.DataFrame({
-            'open': np.random.uniform(90, 110, 50),
-            'high': np.random.uniform(100, 120, 50),
-            'low': np.random.uniform(80, 100, 50),
-            'close': np.random.uniform(95, 105, 50),
-            'volume': np.random.uniform(100000, 200000, 50)
+            'open': rng.uniform(90, 110, 50),
+            'high': rng.uniform(100, 120, 50),
+            'low': rng.uniform(80, 100, 50),
+            'close': rng.uniform(95, 105, 50),
+            'volume': rng.uniform(100000, 200000, 50)
         }, index=dates)
         
         # Fix OHLC relationships
-        for i in range(len(test_data)):
-            high = max(test_data.iloc[i]['open'], test_data.iloc[i]['close'], test_data.iloc[i]['high'])
-            low = min(test_data.iloc[i]['open'], test_data.iloc[i]['close'], test_data.iloc[i]['low'])
-            test_data.iloc[i, test_data.columns.get_loc('high')] = high
-            test_data.iloc[i, test_data.columns.get_loc('low')] = low
+        test_data = test_data.assign(
+            high=np.maximum.reduce(test_data[['open', 'high', 'close']].to_numpy(), axis=1),
+            low=np.minimum.reduce(test_data[['open', 'low', 'close']].to_numpy(), axis=1)
+        )
         
         # Test data integrity
         original_len = len(test_data)
@@ -3,6 +3,7 @@
 End-to-end integration test suite for the complete Backtrader Alerts System
 """
 import unittest
+import io
 import sys
 import os
 import pandas as pd
@@ -15,17 +16,21 @@ import tempfile
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'src'))
 
+from tests.integration.indicators import pct_change, rolling_mean, rolling_mean_std
+
 class TestEndToEndWorkflows(unittest.TestCase):
     """Test complete end-to-end workflows"""
     
-    def setUp(self):
-        """Set up complete test environment"""
-        self.create_test_config()
-        self.create_test_data()
-        
-    def create_test_config(self):
+    @classmethod
+    def setUpClass(cls):
+        """Set up the complete test environment once; tests only read it"""
+        cls.create_test_config()
+        cls.create_test_data()
+        
+    @classmethod
+    def create_test_config(cls):
         """Create complete test configuration"""
-        self.config_data = {
+        cls.config_data = {
             'trading': {
                 'initial_cash': 10000,
                 'commission': 0.001,
@@ -69,77 +74,79 @@ class TestEndToEndWorkflows(unittest.TestCase):
         
         # Create temporary config file
         with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(self.config_data, f)
-            self.config_file = f.name
+            yaml.dump(cls.config_data, f)
+            cls.config_file = f.name
     
-    def create_test_data(self):
+    @classmethod
+    def create_test_data(cls):
         """Create realistic market data for testing"""
         dates = pd.date_range('2023-01-01', periods=100, freq='D')
-        np.random.seed(42)
+        rng = np.random.default_rng(42)  # Local generator, reproducible results
         
         # Generate realistic price data with trends and patterns
         base_price = 100
-        prices = []
-        current_price = base_price
-        
-        for i in range(len(dates)):
-            # Create different market phases
-            if i < 20:  # Downtrend
-                trend = -0.5
-            elif i < 40:  # Sideways
-                trend = 0.1
-            elif i < 70:  # Uptrend
-                trend = 0.8
-            else:  # Volatile
-                trend = np.random.choice([-1, 1]) * 2.0
-            
-            change = np.random.normal(trend, 2.0)
-            current_price *= (1 + change / 100)
-            
-            # Ensure realistic OHLC
-            open_price = current_price * np.random.uniform(0.998, 1.002)
-            high_price = max(open_price, current_price) * np.random.uniform(1.000, 1.005)
-            low_price = min(open_price, current_price) * np.random.uniform(0.995, 1.000)
-            volume = abs(np.random.normal(1000000, 200000))
-            
-            prices.append({
-                'open': open_price,
-                'high': high_price,
-                'low': low_price,
-                'close': current_price,
-                'volume': volume
-            })
-        
-        self.market_data = pd.DataFrame(prices, index=dates)
+        n = len(dates)
+        idx = np.arange(n)
+        
+        # Create different market phases: downtrend, sideways, uptrend, volatile
+        trend = np.select([idx < 20, idx < 40, idx < 70], [-0.5, 0.1, 0.8], default=0.0)
+        volatile = idx >= 70
+        trend[volatile] = rng.choice([-1, 1], size=volatile.sum()) * 2.0
+        
+        changes = rng.normal(trend, 2.0)
+        close = base_price * np.cumprod(1 + changes / 100)
+        
+        # Ensure realistic OHLC
+        open_price = close * rng.uniform(0.998, 1.002, n)
+        high_price = np.maximum(open_price, close) * rng.uniform(1.000, 1.005, n)
+        low_price = np.minimum(open_price, close) * rng.uniform(0.995, 1.000, n)
+        volume = np.abs(rng.normal(1000000, 200000, n))
+        
+        # Columns are already separate float64 arrays, so let pandas wrap them as-is
+        cls.market_data = pd.DataFrame({
+            'open': open_price,
+            'high': high_price,
+            'low': low_price,
+            'close': close,
+            'volume': volume
+        }, index=dates, copy=False)
         
         # Add technical indicators
-        self.add_technical_indicators()
+        cls.add_technical_indicators()
     
-    def add_technical_indicators(self):
+    @classmethod
+    def add_technical_indicators(cls):
         """Add technical indicators to market data"""
+        close = cls.market_data['close'].to_numpy(copy=False)
+        
         # RSI
-        delta = self.market_data['close'].diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        avg_gain = gain.rolling(window=14).mean()
-        avg_loss = loss.rolling(window=14).mean()
-        rs = avg_gain / avg_loss
-        self.market_data['rsi'] = 100 - (100 / (1 + rs))
-        
-        # Moving Averages
-        self.market_data['sma_20'] = self.market_data['close'].rolling(window=20).mean()
-        self.market_data['sma_50'] = self.market_data['close'].rolling(window=50).mean()
+        delta = np.diff(close, prepend=np.nan)
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+        avg_gain = rolling_mean(gain, 14)
+        avg_loss = rolling_mean(loss, 14)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = avg_gain / avg_loss
+        cls.market_data.loc[:, 'rsi'] = 100 - (100 / (1 + rs))
+        
+        # Moving Averages (the 20-bar pass also yields the Bollinger Band std)
+        sma_20, std_20 = rolling_mean_std(close, 20)
+        cls.market_data.loc[:, 'sma_20'] = sma_20
+        cls.market_data.loc[:, 'sma_50'] = rolling_mean(close, 50)
         
         # Bollinger Bands
-        sma = self.market_data['close'].rolling(window=20).mean()
-        std = self.market_data['close'].rolling(window=20).std()
-        self.market_data['bb_upper'] = sma + (std * 2)
-        self.market_data['bb_lower'] = sma - (std * 2)
+        cls.market_data.loc[:, 'bb_upper'] = sma_20 + (std_20 * 2)
+        cls.market_data.loc[:, 'bb_lower'] = sma_20 - (std_20 * 2)
     
-    def tearDown(self):
+    def market_columns(self, *names):
+        """NumPy views of the shared market data columns (read-only, no copies)"""
+        return [self.market_data[name].to_numpy(copy=False) for name in names]
+    
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test environment"""
         try:
-            os.unlink(self.config_file)
+            os.unlink(cls.config_file)
         except:
             pass
     
@@ -157,49 +164,55 @@ class TestEndToEndWorkflows(unittest.TestCase):
         assert config.get('trading.initial_cash') == 10000
         assert config.get('strategies.rsi_crossover.enabled') is True
         
-        # Step 2: Initialize Alert System
-        dispatcher = ConsoleDispatcher(log_to_file=True)
+        # Step 2: Initialize Alert System (file logging into memory, no disk I/O)
+        log_stream = io.StringIO()
+        dispatcher = ConsoleDispatcher(log_to_file=True, log_stream=log_stream)
         
         # Step 3: Process Market Data and Generate Signals
         signals_generated = 0
         trades_executed = 0
         
-        for i, (date, row) in enumerate(self.market_data.iterrows()):
-            if i < 20:  # Skip initial period for indicators
-                continue
-                
+        # Pull the indicator columns out once and find signal bars with masks
+        close, rsi, sma_20, sma_50 = self.market_columns('close', 'rsi', 'sma_20', 'sma_50')
+        
+        warmed_up = np.arange(len(close)) >= 20  # Skip initial period for indicators
+        rsi_ok = warmed_up & ~np.isnan(rsi)
+        sma_ok = warmed_up & ~np.isnan(sma_20) & ~np.isnan(sma_50)
+        rsi_buy = rsi_ok & (rsi < 30)  # Oversold
+        rsi_sell = rsi_ok & (rsi > 70)  # Overbought
+        multi_buy = sma_ok & (close > sma_20) & (sma_20 > sma_50)
+        
+        for i in np.flatnonzero(rsi_buy | rsi_sell | multi_buy):
             # RSI Strategy Signals
-            if pd.notna(row['rsi']):
-                if row['rsi'] < 30:  # Oversold
-                    dispatcher.send_strategy_signal(
-                        "RSI_Strategy", 
-                        "BUY", 
-                        "TEST-SYMBOL",
-                        [f"RSI oversold: {row['rsi']:.1f}"]
-                    )
-                    signals_generated += 1
-                    trades_executed += 1
-                    
-                elif row['rsi'] > 70:  # Overbought
-                    dispatcher.send_strategy_signal(
-                        "RSI_Strategy",
-                        "SELL", 
-                        "TEST-SYMBOL",
-                        [f"RSI overbought: {row['rsi']:.1f}"]
-                    )
-                    signals_generated += 1
-                    trades_executed += 1
+            if rsi_buy[i]:
+                dispatcher.send_strategy_signal(
+                    "RSI_Strategy", 
+                    "BUY", 
+                    "TEST-SYMBOL",
+                    [f"RSI oversold: {rsi[i]:.1f}"]
+                )
+                signals_generated += 1
+                trades_executed += 1
+                
+            elif rsi_sell[i]:
+                dispatcher.send_strategy_signal(
+                    "RSI_Strategy",
+                    "SELL", 
+                    "TEST-SYMBOL",
+                    [f"RSI overbought: {rsi[i]:.1f}"]
+                )
+                signals_generated += 1
+                trades_executed += 1
             
             # Multi-Indicator Strategy
-            if pd.notna(row['sma_20']) and pd.notna(row['sma_50']):
-                if row['close'] > row['sma_20'] and row['sma_20'] > row['sma_50']:
-                    dispatcher.send_strategy_signal(
-                        "Multi_Indicator_Strategy",
-                        "BUY",
-                        "TEST-SYMBOL", 
-                        ["Price > SMA20", "SMA20 > SMA50", "Bullish alignment"]
-                    )
-                    signals_generated += 1
+            if multi_buy[i]:
+                dispatcher.send_strategy_signal(
+                    "Multi_Indicator_Strategy",
+                    "BUY",
+                    "TEST-SYMBOL", 
+                    ["Price > SMA20", "SMA20 > SMA50", "Bullish alignment"]
+                )
+                signals_generated += 1
         
         # Step 4: Verify End-to-End Results
         all_alerts = dispatcher.get_alerts_history()
@@ -213,6 +226,9 @@ class TestEndToEndWorkflows(unittest.TestCase):
             f"System Performance: {signals_generated} signals, {trades_executed} trades"
         )
         
+        logged_alerts = log_stream.getvalue().splitlines()
+        assert len(logged_alerts) == signals_generated + 1, "Logged alert count mismatch"
+        
         print(f"   Signals generated: {signals_generated}")
         print(f"   Trades executed: {trades_executed}")
         print(f"   Total alerts: {len(all_alerts)}")
@@ -234,52 +250,57 @@ class TestEndToEndWorkflows(unittest.TestCase):
         }
         
         # Process market data with multiple strategies
-        for i in range(20, len(self.market_data)):
-            row = self.market_data.iloc[i]
-            prev_row = self.market_data.iloc[i-1]
-            
-            price_change = (row['close'] - prev_row['close']) / prev_row['close']
-            
-            # Momentum Strategy
-            if abs(price_change) > strategies['Momentum']['threshold']:
-                signal = "BUY" if price_change > 0 else "SELL"
-                dispatcher.send_strategy_signal(
-                    "Momentum_Strategy",
-                    signal,
-                    "MOMENTUM-TEST",
-                    [f"Price momentum: {price_change:.2%}"]
-                )
-                strategies['Momentum']['signals'] += 1
-            
-            # Mean Reversion Strategy  
-            if pd.notna(row['rsi']):
-                if row['rsi'] < 25:  # Extreme oversold
-                    dispatcher.send_strategy_signal(
-                        "Mean_Reversion_Strategy",
-                        "BUY",
-                        "REVERSION-TEST",
-                        [f"Extreme RSI: {row['rsi']:.1f}"]
-                    )
-                    strategies['Mean_Reversion']['signals'] += 1
-                elif row['rsi'] > 75:  # Extreme overbought
-                    dispatcher.send_strategy_signal(
-                        "Mean_Reversion_Strategy", 
-                        "SELL",
-                        "REVERSION-TEST",
-                        [f"Extreme RSI: {row['rsi']:.1f}"]
-                    )
-                    strategies['Mean_Reversion']['signals'] += 1
-            
-            # Trend Following Strategy
-            if pd.notna(row['sma_20']) and pd.notna(row['sma_50']):
-                if row['sma_20'] > row['sma_50'] and prev_row['sma_20'] <= prev_row['sma_50']:
-                    dispatcher.send_strategy_signal(
-                        "Trend_Following_Strategy",
-                        "BUY", 
-                        "TREND-TEST",
-                        ["SMA crossover bullish"]
-                    )
-                    strategies['Trend_Following']['signals'] += 1
+        close, rsi, sma_20, sma_50 = self.market_columns('close', 'rsi', 'sma_20', 'sma_50')
+        price_changes = pct_change(close)
+        
+        # Signal bars per strategy, from bar 20 onwards
+        warmed_up = np.arange(len(close)) >= 20
+        rsi_ok = warmed_up & ~np.isnan(rsi)
+        sma_ok = ~np.isnan(sma_20) & ~np.isnan(sma_50)
+        momentum_idx = np.flatnonzero(warmed_up & (np.abs(price_changes) > strategies['Momentum']['threshold']))
+        oversold_idx = np.flatnonzero(rsi_ok & (rsi < 25))  # Extreme oversold
+        overbought_idx = np.flatnonzero(rsi_ok & (rsi > 75))  # Extreme overbought
+        crossed_up = np.zeros(len(close), dtype=bool)
+        crossed_up[1:] = (sma_ok[1:] & (sma_20[1:] > sma_50[1:])
+                          & sma_ok[:-1] & (sma_20[:-1] <= sma_50[:-1]))
+        crossover_idx = np.flatnonzero(warmed_up & crossed_up)
+        
+        # Momentum Strategy
+        for i in momentum_idx:
+            dispatcher.send_strategy_signal(
+                "Momentum_Strategy",
+                "BUY" if price_changes[i] > 0 else "SELL",
+                "MOMENTUM-TEST",
+                [f"Price momentum: {price_changes[i]:.2%}"]
+            )
+        strategies['Momentum']['signals'] += len(momentum_idx)
+        
+        # Mean Reversion Strategy
+        for i in oversold_idx:
+            dispatcher.send_strategy_signal(
+                "Mean_Reversion_Strategy",
+                "BUY",
+                "REVERSION-TEST",
+                [f"Extreme RSI: {rsi[i]:.1f}"]
+            )
+        for i in overbought_idx:
+            dispatcher.send_strategy_signal(
+                "Mean_Reversion_Strategy", 
+                "SELL",
+                "REVERSION-TEST",
+                [f"Extreme RSI: {rsi[i]:.1f}"]
+            )
+        strategies['Mean_Reversion']['signals'] += len(oversold_idx) + len(overbought_idx)
+        
+        # Trend Following Strategy
+        for i in crossover_idx:
+            dispatcher.send_strategy_signal(
+                "Trend_Following_Strategy",
+                "BUY", 
+                "TREND-TEST",
+                ["SMA crossover bullish"]
+            )
+        strategies['Trend_Following']['signals'] += len(crossover_idx)
         
         # Verify multi-strategy coordination
         total_signals = sum(s['signals'] for s in strategies.values())
@@ -389,33 +410,32 @@ class TestEndToEndWorkflows(unittest.TestCase):
         trades = []
         
         # Generate realistic trading scenario
-        for i in range(20, min(50, len(self.market_data))):
-            row = self.market_data.iloc[i]
+        [close] = self.market_columns('close')
+        price_changes = pct_change(close)
+        
+        # Simple momentum strategy for testing: significant moves in bars 21..49
+        window = np.arange(len(close))
+        significant = (window > 20) & (window < 50) & (np.abs(price_changes) > 0.02)
+        
+        for i in np.flatnonzero(significant):
+            action = "BUY" if price_changes[i] > 0 else "SELL"
+            size = 100  # Fixed size for testing
+            trade_value = close[i] * size
             
-            # Simple momentum strategy for testing
-            if i > 20:
-                prev_row = self.market_data.iloc[i-1]
-                price_change = (row['close'] - prev_row['close']) / prev_row['close']
-                
-                if abs(price_change) > 0.02:  # Significant move
-                    action = "BUY" if price_change > 0 else "SELL"
-                    size = 100  # Fixed size for testing
-                    trade_value = row['close'] * size
-                    
-                    if action == "BUY":
-                        current_portfolio -= trade_value
-                    else:
-                        current_portfolio += trade_value
-                    
-                    trades.append({
-                        'action': action,
-                        'price': row['close'],
-                        'size': size,
-                        'value': trade_value,
-                        'portfolio': current_portfolio
-                    })
-                    
-                    dispatcher.send_alert(action, "PERF-TEST", row['close'], size)
+            if action == "BUY":
+                current_portfolio -= trade_value
+            else:
+                current_portfolio += trade_value
+            
+            trades.append({
+                'action': action,
+                'price': close[i],
+                'size': size,
+                'value': trade_value,
+                'portfolio': current_portfolio
+            })
+            
+            dispatcher.send_alert(action, "PERF-TEST", close[i], size)
         
         # Calculate performance metrics
         total_trades = len(trades)
@@ -461,18 +481,14 @@ class TestEndToEndWorkflows(unittest.TestCase):
         
         # Test high-frequency alert generation
         start_time = time.time()
-        alert_count = 0
         
-        # Generate alerts rapidly
-        for i in range(100):
-            for strategy in ['FastScalp', 'QuickTrend', 'RapidMomentum']:
-                dispatcher.send_strategy_signal(
-                    strategy,
-                    "BUY" if i % 2 == 0 else "SELL",
-                    f"SYMBOL-{i % 10}",
-                    [f"Signal {i}"]
-                )
-                alert_count += 1
+        # Generate alerts rapidly, submitted as a single batch
+        records = [
+            (strategy, "BUY" if i % 2 == 0 else "SELL", f"SYMBOL-{i % 10}", [f"Signal {i}"])
+            for i in range(100)
+            for strategy in ['FastScalp', 'QuickTrend', 'RapidMomentum']
+        ]
+        alert_count = dispatcher.send_strategy_signals_bulk(records)
         
         processing_time = time.time() - start_time
         alerts_per_second = alert_count / processing_time
@@ -7,86 +7,101 @@ import sys
 import os
 import pandas as pd
 import numpy as np
+from collections import Counter
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'src'))
 
+from src.alerts.console_dispatcher import ConsoleDispatcher
+from tests.integration.indicators import wilder_rsi
+
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+def moving_average(close, window):
+    """Simple moving average, NaN until the window is full (bottleneck when installed)"""
+    # bottleneck rejects windows longer than the series (all-NaN in pandas)
+    if bn is not None and window <= len(close):
+        return bn.move_mean(close, window, min_count=window)
+    return pd.Series(close).rolling(window=window).mean().to_numpy()
+
 class TestMultiTimeframeWorkflows(unittest.TestCase):
     """Test multi-timeframe strategy workflows and data coordination"""
     
-    def setUp(self):
-        """Set up test environment with multi-timeframe data"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up multi-timeframe data once; tests only read it"""
         # Create sample data for different timeframes
-        self.create_multi_timeframe_data()
+        cls.create_multi_timeframe_data()
     
-    def create_multi_timeframe_data(self):
+    @classmethod
+    def create_multi_timeframe_data(cls):
         """Create realistic multi-timeframe market data"""
         # Generate 1h data (base timeframe) - more data for better aggregation
         hourly_dates = pd.date_range('2023-01-01', periods=720, freq='h')  # 30 days
-        np.random.seed(42)
+        rng = np.random.default_rng(42)  # Reproducible results
         
         # Generate trending price data
         base_price = 100
-        hourly_prices = []
-        current_price = base_price
-        
-        for i in range(len(hourly_dates)):
-            # Create intraday patterns
-            hour = hourly_dates[i].hour
-            if 9 <= hour <= 16:  # Market hours - more volatility
-                change = np.random.normal(0.1, 1.5)
-            else:  # After hours - less volatility
-                change = np.random.normal(0, 0.5)
-            
-            current_price *= (1 + change / 100)
-            
-            hourly_prices.append({
-                'open': current_price * 0.999,
-                'high': current_price * 1.002,
-                'low': current_price * 0.998,
-                'close': current_price,
-                'volume': abs(np.random.normal(50000, 10000))
-            })
         
-        self.hourly_data = pd.DataFrame(hourly_prices, index=hourly_dates)
+        # Create intraday patterns: market hours (9-16) are more volatile
+        hours = hourly_dates.hour.to_numpy()
+        market_hours = (hours >= 9) & (hours <= 16)
+        changes = rng.normal(np.where(market_hours, 0.1, 0.0), np.where(market_hours, 1.5, 0.5))
+        current_price = base_price * np.cumprod(1 + changes / 100)
+        
+        cls.hourly_data = pd.DataFrame({
+            'open': current_price * 0.999,
+            'high': current_price * 1.002,
+            'low': current_price * 0.998,
+            'close': current_price,
+            'volume': np.abs(rng.normal(50000, 10000, len(hourly_dates)))
+        }, index=hourly_dates, copy=False)
         
         # Generate 4h data (aggregated from hourly)
-        self.four_hour_data = self.aggregate_to_timeframe(self.hourly_data, '4h')
+        cls.four_hour_data = cls.aggregate_to_timeframe(cls.hourly_data, '4h')
         
         # Generate daily data (aggregated from hourly)
-        self.daily_data = self.aggregate_to_timeframe(self.hourly_data, 'D')
+        cls.daily_data = cls.aggregate_to_timeframe(cls.hourly_data, 'D')
         
         # Add technical indicators
-        self.add_indicators_to_data()
+        cls.add_indicators_to_data()
+        
+        # Hot columns as NumPy arrays for the signal tests
+        cls.h_close = cls.hourly_data['close'].to_numpy()
+        cls.h_sma20 = cls.hourly_data['sma_20'].to_numpy()
+        cls.h_rsi = cls.hourly_data['rsi'].to_numpy()
+        cls.h4_rsi = cls.four_hour_data['rsi'].to_numpy()
+        cls.d_rsi = cls.daily_data['rsi'].to_numpy()
     
-    def aggregate_to_timeframe(self, data, timeframe):
+    @classmethod
+    def aggregate_to_timeframe(cls, data, timeframe):
         """Aggregate data to different timeframe"""
-        ohlc_dict = {
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last',
-            'volume': 'sum'
-        }
-        return data.resample(timeframe).agg(ohlc_dict).dropna()
+        # One grouper, with each column going straight to its native reducer
+        grouped = data.groupby(pd.Grouper(freq=timeframe))
+        return pd.DataFrame({
+            'open': grouped['open'].first(),
+            'high': grouped['high'].max(),
+            'low': grouped['low'].min(),
+            'close': grouped['close'].last(),
+            'volume': grouped['volume'].sum()
+        }).dropna()
     
-    def add_indicators_to_data(self):
+    @classmethod
+    def add_indicators_to_data(cls):
         """Add technical indicators to all timeframes"""
-        for name, data in [('1h', self.hourly_data), ('4h', self.four_hour_data), ('1d', self.daily_data)]:
+        for name, data in [('1h', cls.hourly_data), ('4h', cls.four_hour_data), ('1d', cls.daily_data)]:
             # Simple Moving Average
-            data['sma_20'] = data['close'].rolling(window=20).mean()
-            data['sma_50'] = data['close'].rolling(window=50).mean()
+            close = data['close'].to_numpy()
+            data['sma_20'] = moving_average(close, 20)
+            data['sma_50'] = moving_average(close, 50)
             
-            # RSI
-            delta = data['close'].diff()
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-            avg_gain = gain.rolling(window=14).mean()
-            avg_loss = loss.rolling(window=14).mean()
-            rs = avg_gain / avg_loss
-            data['rsi'] = 100 - (100 / (1 + rs))
+            # RSI (Wilder smoothing)
+            data['rsi'] = wilder_rsi(close, 14)
     
     def test_multi_timeframe_data_consistency(self):
         """Test data consistency across timeframes"""
@@ -97,11 +112,9 @@ class TestMultiTimeframeWorkflows(unittest.TestCase):
         
         # Test OHLC relationships within each timeframe
         for name, data in [('1h', self.hourly_data), ('4h', self.four_hour_data), ('1d', self.daily_data)]:
-            assert (data['high'] >= data['low']).all(), f"High < Low in {name} data"
-            assert (data['high'] >= data['open']).all(), f"High < Open in {name} data"
-            assert (data['high'] >= data['close']).all(), f"High < Close in {name} data"
-            assert (data['low'] <= data['open']).all(), f"Low > Open in {name} data"
-            assert (data['low'] <= data['close']).all(), f"Low > Close in {name} data"
+            open_, high, low, close = data[['open', 'high', 'low', 'close']].to_numpy().T
+            ok = (high >= low) & (high >= open_) & (high >= close) & (low <= open_) & (low <= close)
+            assert ok.all(), f"OHLC relationship violated in {name} data at rows {np.flatnonzero(~ok)[:5]}"
         
         print("✅ Multi-timeframe data consistency verified")
     
@@ -109,35 +122,31 @@ class TestMultiTimeframeWorkflows(unittest.TestCase):
         """Test signal generation across multiple timeframes"""
         print("\n⚡ Testing: Cross-Timeframe Signal Generation")
         
-        from src.alerts.console_dispatcher import ConsoleDispatcher
-        
         dispatcher = ConsoleDispatcher()
-        signals_generated = 0
         
         # Simulate cross-timeframe analysis - simplified for testing
-        signals_generated = 0
-        for i in range(50, min(100, len(self.hourly_data))):  # Start later to ensure indicators are calculated
-            h1_current = self.hourly_data.iloc[i]
+        # Start later to ensure indicators are calculated
+        close = self.h_close[50:]
+        sma_20 = self.h_sma20[50:]
+        rsi = self.h_rsi[50:]
+        
+        # Simplified multi-timeframe condition for testing (NaN never matches)
+        mask = (close > sma_20) & (rsi < 50)
+        signal_idx = np.flatnonzero(mask)[:3]  # Generate a few test signals
+        
+        for i in signal_idx:
+            conditions = [
+                f"1h close ({close[i]:.2f}) > 1h SMA20 ({sma_20[i]:.2f})",
+                f"1h RSI ({rsi[i]:.1f}) < 50"
+            ]
             
-            # Simplified multi-timeframe condition for testing
-            if pd.notna(h1_current.get('sma_20', np.nan)) and pd.notna(h1_current.get('rsi', np.nan)):
-                # Generate test signals based on simple conditions
-                if h1_current['close'] > h1_current['sma_20'] and h1_current['rsi'] < 50:
-                    conditions = [
-                        f"1h close ({h1_current['close']:.2f}) > 1h SMA20 ({h1_current['sma_20']:.2f})",
-                        f"1h RSI ({h1_current['rsi']:.1f}) < 50"
-                    ]
-                    
-                    dispatcher.send_strategy_signal(
-                        "Multi_Timeframe_Strategy",
-                        "BUY",
-                        "TEST-SYMBOL",
-                        conditions
-                    )
-                    signals_generated += 1
-                    
-                    if signals_generated >= 3:  # Generate a few test signals
-                        break
+            dispatcher.send_strategy_signal(
+                "Multi_Timeframe_Strategy",
+                "BUY",
+                "TEST-SYMBOL",
+                conditions
+            )
+        signals_generated = len(signal_idx)
         
         # Verify signals were generated
         strategy_signals = dispatcher.get_alerts_by_type('strategy_signal')
@@ -151,65 +160,31 @@ class TestMultiTimeframeWorkflows(unittest.TestCase):
         """Test coordination between different timeframe strategies"""
         print("\n🔄 Testing: Timeframe Coordination")
         
-        from src.alerts.console_dispatcher import ConsoleDispatcher
-        
         dispatcher = ConsoleDispatcher()
         
         # Simulate different strategies on different timeframes
         strategies = [
-            ("Scalping_1h", "1h", self.hourly_data[-10:]),
-            ("Swing_4h", "4h", self.four_hour_data[-5:]),
-            ("Position_1d", "1d", self.daily_data[-3:])
+            ("Scalping_1h", "1h", self.h_rsi[-10:], 75.0),
+            ("Swing_4h", "4h", self.h4_rsi[-5:], 35.0),
+            ("Position_1d", "1d", self.d_rsi[-3:], 50.0)
         ]
         
-        for strategy_name, timeframe, data in strategies:
-            # Ensure we generate at least one signal per timeframe for testing
-            signal_generated = False
-            for i, (timestamp, row) in enumerate(data.iterrows()):
-                rsi_value = row.get('rsi', np.nan)
-                if pd.notna(rsi_value):
-                    # Different RSI thresholds for different timeframes
-                    if timeframe == "1h" and rsi_value > 70:
-                        signal = "SELL"
-                    elif timeframe == "4h" and rsi_value < 40:
-                        signal = "BUY"  
-                    elif timeframe == "1d" and 45 < rsi_value < 55:
-                        signal = "HOLD"
-                    else:
-                        continue
-                        
-                    conditions = [f"{timeframe} RSI: {rsi_value:.1f}"]
-                    dispatcher.send_strategy_signal(strategy_name, signal, f"SYMBOL-{timeframe}", conditions)
-                    signal_generated = True
-                elif i < 2:  # Generate test signals for all timeframes
-                    if timeframe == "1h":
-                        signal = "SELL"
-                        rsi_value = 75.0
-                    elif timeframe == "4h":
-                        signal = "BUY"
-                        rsi_value = 35.0
-                    elif timeframe == "1d":
-                        signal = "HOLD"
-                        rsi_value = 50.0
-                    else:
-                        continue
-                        
-                    conditions = [f"{timeframe} RSI: {rsi_value:.1f} (mock)"]
-                    dispatcher.send_strategy_signal(strategy_name, signal, f"SYMBOL-{timeframe}", conditions)
-                    signal_generated = True
+        for strategy_name, timeframe, rsi, latest_rsi in strategies:
+            # Pin the latest RSI inside this timeframe's threshold so every
+            # strategy signals deterministically, on a copy so the shared data is untouched
+            rsi = rsi.copy()
+            rsi[-1] = latest_rsi
             
-            # Force generate a signal if none was generated for this timeframe
-            if not signal_generated:
-                if timeframe == "1h":
-                    signal, rsi_value = "SELL", 75.0
-                elif timeframe == "4h":
-                    signal, rsi_value = "BUY", 35.0
-                elif timeframe == "1d":
-                    signal, rsi_value = "HOLD", 50.0
-                else:
-                    continue
-                
-                conditions = [f"{timeframe} RSI: {rsi_value:.1f} (forced)"]
+            # Different RSI thresholds for different timeframes (NaN never matches)
+            if timeframe == "1h":
+                signal, mask = "SELL", rsi > 70
+            elif timeframe == "4h":
+                signal, mask = "BUY", rsi < 40
+            else:
+                signal, mask = "HOLD", (rsi > 45) & (rsi < 55)
+            
+            for i in np.flatnonzero(mask):
+                conditions = [f"{timeframe} RSI: {rsi[i]:.1f}"]
                 dispatcher.send_strategy_signal(strategy_name, signal, f"SYMBOL-{timeframe}", conditions)
         
         # Verify coordination
@@ -233,8 +208,6 @@ class TestMultiTimeframeWorkflows(unittest.TestCase):
         """Test handling of conflicting signals across timeframes"""
         print("\n⚖️ Testing: Timeframe Conflict Resolution")
         
-        from src.alerts.console_dispatcher import ConsoleDispatcher
-        
         dispatcher = ConsoleDispatcher()
         
         # Simulate conflicting signals
@@ -253,10 +226,7 @@ class TestMultiTimeframeWorkflows(unittest.TestCase):
         symbol_signals = [s for s in dispatcher.get_alerts_by_type('strategy_signal') 
                          if s.get('symbol') == symbol]
         
-        signals_by_type = {}
-        for signal in symbol_signals:
-            signal_type = signal.get('signal')
-            signals_by_type[signal_type] = signals_by_type.get(signal_type, 0) + 1
+        signals_by_type = Counter(signal.get('signal') for signal in symbol_signals)
         
         # Should have conflicting signals
         assert len(signals_by_type) > 1, "Should have conflicting signals"
@@ -267,7 +237,7 @@ class TestMultiTimeframeWorkflows(unittest.TestCase):
             f"{', '.join([f'{sig}({count})' for sig, count in signals_by_type.items()])}"
         )
         
-        print(f"   Conflicts detected: {signals_by_type}")
+        print(f"   Conflicts detected: {dict(signals_by_type)}")
         print("✅ Timeframe conflict resolution working")
     
     def test_multi_timeframe_indicator_synchronization(self):
@@ -302,9 +272,6 @@ class TestMultiTimeframeWorkflows(unittest.TestCase):
         """Test real-time updates across multiple timeframes"""
         print("\n⏰ Testing: Real-Time Multi-Timeframe Updates")
         
-        from src.alerts.console_dispatcher import ConsoleDispatcher
-        import time
-        
         dispatcher = ConsoleDispatcher()
         
         # Simulate real-time price updates affecting multiple timeframes
@@ -325,9 +292,6 @@ class TestMultiTimeframeWorkflows(unittest.TestCase):
             if price > 102:  # 4h timeframe alert 
                 dispatcher.send_custom_alert(f"4h Alert: Strong move above 102 at {price}")
                 alerts_generated += 1
-            
-            # Small delay to simulate real-time
-            time.sleep(0.01)
         
         # Verify real-time updates
         custom_alerts = dispatcher.get_alerts_by_type('custom')
@@ -342,24 +306,19 @@ class TestMultiTimeframeWorkflows(unittest.TestCase):
         """Test performance tracking across timeframes"""
         print("\n📈 Testing: Multi-Timeframe Performance Tracking")
         
-        from src.alerts.console_dispatcher import ConsoleDispatcher
-        
         dispatcher = ConsoleDispatcher()
         
         # Simulate trades from different timeframe strategies
         trades = [
-            ("Scalp_1h", "BUY", "AAPL", 150.00, 0.1, "1h RSI oversold"),
-            ("Scalp_1h", "SELL", "AAPL", 151.50, 0.1, "1h quick profit"),
-            ("Swing_4h", "BUY", "TSLA", 800.00, 0.05, "4h trend breakout"),
-            ("Position_1d", "BUY", "BTC", 50000.00, 0.01, "Daily accumulation")
+            ("Scalp_1h", "1h", "BUY", "AAPL", 150.00, 0.1, "1h RSI oversold"),
+            ("Scalp_1h", "1h", "SELL", "AAPL", 151.50, 0.1, "1h quick profit"),
+            ("Swing_4h", "4h", "BUY", "TSLA", 800.00, 0.05, "4h trend breakout"),
+            ("Position_1d", "1d", "BUY", "BTC", 50000.00, 0.01, "Daily accumulation")
         ]
         
         performance_by_timeframe = {}
         
-        for strategy, action, symbol, price, size, reason in trades:
-            # Extract timeframe from strategy name
-            timeframe = strategy.split('_')[1] if '_' in strategy else 'unknown'
-            
+        for strategy, timeframe, action, symbol, price, size, reason in trades:
             if timeframe not in performance_by_timeframe:
                 performance_by_timeframe[timeframe] = {'trades': 0, 'volume': 0}
             
@@ -437,9 +396,9 @@ class TestTimeframeDataIntegrity(unittest.TestCase):
         four_hour_data = data.resample('4h').agg({'close': 'last'})
         four_hour_sma = four_hour_data['close'].rolling(window=3).mean()  # Equivalent period
         
-        # Test trend consistency
-        hourly_trend_up = (hourly_sma.diff() > 0).sum() > (hourly_sma.diff() < 0).sum()
-        four_hour_trend_up = (four_hour_sma.diff() > 0).sum() > (four_hour_sma.diff() < 0).sum()
+        # Test trend consistency (more up-steps than down-steps)
+        hourly_trend_up = np.sign(np.diff(hourly_sma.dropna().to_numpy())).sum() > 0
+        four_hour_trend_up = np.sign(np.diff(four_hour_sma.dropna().to_numpy())).sum() > 0
         
         assert hourly_trend_up, "Hourly trend should be up"
         assert four_hour_trend_up, "4h trend should be up"
@@ -5,6 +5,8 @@ Integration tests for strategy execution and alerts
 import unittest
 import sys
 import os
+import tempfile
+from collections import deque
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -13,12 +15,18 @@ from unittest.mock import Mock, patch, MagicMock
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'src'))
 
+from src.alerts.console_dispatcher import ConsoleDispatcher
+from tests.integration.indicators import wilder_rsi
+
+TRADE_ACTIONS = frozenset({'BUY', 'SELL'})
+
 class MockBacktraderStrategy:
     """Mock strategy for testing without backtrader"""
     def __init__(self, **params):
         self.params = type('params', (), params)()
-        self.alerts_sent = []
-        self.trades_executed = []
+        # Append-only logs; deques never reallocate as they grow
+        self.alerts_sent = deque()
+        self.trades_executed = deque()
         self.alert_dispatcher = None
         
     def set_alert_dispatcher(self, dispatcher):
@@ -44,65 +52,51 @@ class MockBacktraderStrategy:
 class TestStrategyExecution(unittest.TestCase):
     """Test strategy execution with alerts"""
     
-    def setUp(self):
-        """Set up test environment"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once; tests only read the market data"""
         # Create sample market data
         dates = pd.date_range('2023-01-01', periods=100, freq='D')
-        np.random.seed(42)
-        
-        # Generate trending data with RSI signals
-        prices = []
-        base_price = 100
-        
-        for i in range(len(dates)):
-            # Create trend with some RSI oversold/overbought conditions
-            if i < 20:
-                change = -2.0  # Downtrend (should create oversold)
-            elif i < 40:
-                change = 0.1   # Sideways
-            elif i < 60:
-                change = 1.5   # Uptrend (should create overbought)
-            else:
-                change = np.random.normal(0, 1.0)  # Random
-            
-            base_price *= (1 + change / 100)
-            
-            prices.append({
-                'open': base_price * 0.999,
-                'high': base_price * 1.005,
-                'low': base_price * 0.995,
-                'close': base_price,
-                'volume': 1000000
-            })
-        
-        self.market_data = pd.DataFrame(prices, index=dates)
+        rng = np.random.default_rng(42)  # Local generator, reproducible results
+        
+        # Daily % changes that create RSI oversold/overbought conditions:
+        # downtrend (oversold), sideways, uptrend (overbought), then random
+        changes = np.concatenate([
+            np.full(20, -2.0),
+            np.full(20, 0.1),
+            np.full(20, 1.5),
+            rng.normal(0, 1.0, len(dates) - 60)
+        ])
+        close = 100 * np.cumprod(1 + changes / 100)
+        
+        cls.market_data = pd.DataFrame({
+            'open': close * 0.999,
+            'high': close * 1.005,
+            'low': close * 0.995,
+            'close': close,
+            'volume': 1000000
+        }, index=dates, copy=False)
         
         # Calculate RSI for testing
-        self._add_rsi_to_data()
+        cls._add_rsi_to_data()
+        
+        # One dispatcher for the class, emptied before each test
+        cls.dispatcher = ConsoleDispatcher()
+    
+    def setUp(self):
+        self.dispatcher.clear_history()
     
-    def _add_rsi_to_data(self):
+    @classmethod
+    def _add_rsi_to_data(cls):
         """Add RSI values to market data for testing"""
-        closes = self.market_data['close']
-        delta = closes.diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        
-        avg_gain = gain.rolling(window=14).mean()
-        avg_loss = loss.rolling(window=14).mean()
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        self.market_data['rsi'] = rsi
+        cls.market_data['rsi'] = wilder_rsi(cls.market_data['close'].to_numpy(), 14)
     
     def test_strategy_with_console_alerts(self):
         """Test strategy execution with console alerts"""
         print("\n📊 Testing: Strategy + Console Alerts")
         
-        from src.alerts.console_dispatcher import ConsoleDispatcher
-        
         # Create console dispatcher
-        dispatcher = ConsoleDispatcher()
+        dispatcher = self.dispatcher
         
         # Create mock strategy
         strategy = MockBacktraderStrategy(
@@ -113,22 +107,19 @@ class TestStrategyExecution(unittest.TestCase):
         strategy.set_alert_dispatcher(dispatcher)
         
         # Simulate strategy signals based on RSI
+        rsi = self.market_data['rsi'].to_numpy()
+        close = self.market_data['close'].to_numpy()
+        prev_rsi = np.concatenate([[np.nan], rsi[:-1]])
+        
+        # Buy signal: RSI crosses above oversold; Sell signal: RSI crosses below overbought
+        # (NaN compares False, so bars without an RSI pair never signal)
+        buy_mask = (rsi > 30) & (prev_rsi <= 30)
+        sell_mask = (rsi < 70) & (prev_rsi >= 70)
+        
         trades_count = 0
-        for i, (date, row) in enumerate(self.market_data.iterrows()):
-            if pd.notna(row['rsi']):
-                # Buy signal: RSI crosses above oversold
-                if row['rsi'] > 30 and i > 0:
-                    prev_rsi = self.market_data.iloc[i-1]['rsi']
-                    if pd.notna(prev_rsi) and prev_rsi <= 30:
-                        strategy.simulate_trade('BUY', 'TEST-SYMBOL', row['close'])
-                        trades_count += 1
-                
-                # Sell signal: RSI crosses below overbought  
-                if row['rsi'] < 70 and i > 0:
-                    prev_rsi = self.market_data.iloc[i-1]['rsi']
-                    if pd.notna(prev_rsi) and prev_rsi >= 70:
-                        strategy.simulate_trade('SELL', 'TEST-SYMBOL', row['close'])
-                        trades_count += 1
+        for i in np.flatnonzero(buy_mask | sell_mask):
+            strategy.simulate_trade('BUY' if buy_mask[i] else 'SELL', 'TEST-SYMBOL', close[i])
+            trades_count += 1
         
         # Verify alerts were sent
         alerts = dispatcher.get_alerts_history()
@@ -139,12 +130,10 @@ class TestStrategyExecution(unittest.TestCase):
         buy_alerts = dispatcher.get_alerts_by_type('BUY')
         sell_alerts = dispatcher.get_alerts_by_type('SELL')
         
-        print(f"   Trades executed: {len(strategy.trades_executed)}")
-        print(f"   Buy alerts: {len(buy_alerts)}")
-        print(f"   Sell alerts: {len(sell_alerts)}")
-        print(f"   Total alerts: {len(alerts)}")
-        
-        assert len(alerts) == len(strategy.trades_executed), "Mismatch between trades and alerts"
+        assert len(alerts) == len(strategy.trades_executed), (
+            f"Mismatch between trades and alerts: {len(strategy.trades_executed)} trades, "
+            f"{len(alerts)} alerts ({len(buy_alerts)} BUY, {len(sell_alerts)} SELL)"
+        )
         
         print("✅ Strategy execution with console alerts working")
     
@@ -152,9 +141,7 @@ class TestStrategyExecution(unittest.TestCase):
         """Test multiple strategies working together"""
         print("\n🔄 Testing: Multi-Strategy Coordination")
         
-        from src.alerts.console_dispatcher import ConsoleDispatcher
-        
-        dispatcher = ConsoleDispatcher()
+        dispatcher = self.dispatcher
         
         # Create different strategies
         rsi_strategy = MockBacktraderStrategy(
@@ -185,7 +172,7 @@ class TestStrategyExecution(unittest.TestCase):
         assert len(alerts) == 2, "Expected 2 alerts from 2 strategies"
         
         # Check different symbols were used
-        symbols = set(alert.get('symbol') for alert in alerts)
+        symbols = {alert['symbol'] for alert in alerts}
         assert len(symbols) == 2, "Strategies should use different symbols"
         
         print("✅ Multi-strategy coordination working")
@@ -194,9 +181,7 @@ class TestStrategyExecution(unittest.TestCase):
         """Test strategy error handling and recovery"""
         print("\n🚨 Testing: Strategy Error Handling")
         
-        from src.alerts.console_dispatcher import ConsoleDispatcher
-        
-        dispatcher = ConsoleDispatcher()
+        dispatcher = self.dispatcher
         
         # Simulate strategy errors
         dispatcher.send_error_alert(
@@ -227,9 +212,7 @@ class TestStrategyExecution(unittest.TestCase):
         """Test strategy performance tracking"""
         print("\n📈 Testing: Strategy Performance Tracking")
         
-        from src.alerts.console_dispatcher import ConsoleDispatcher
-        
-        dispatcher = ConsoleDispatcher()
+        dispatcher = self.dispatcher
         strategy = MockBacktraderStrategy(name="Performance_Test")
         strategy.set_alert_dispatcher(dispatcher)
         
@@ -244,79 +227,77 @@ class TestStrategyExecution(unittest.TestCase):
         ]
         
         total_pnl = 0
+        open_positions = {}  # symbol -> price of the last BUY
         for action, symbol, price, size in trades:
             strategy.simulate_trade(action, symbol, price, size)
             
             # Calculate P&L for pairs
-            if action == 'SELL':
-                # Find corresponding BUY
-                buy_trades = [t for t in strategy.trades_executed 
-                             if t['action'] == 'BUY' and t['symbol'] == symbol]
-                if buy_trades:
-                    buy_price = buy_trades[-1]['price']
+            if action == 'BUY':
+                open_positions[symbol] = price
+            elif action == 'SELL':
+                # Close the corresponding BUY
+                buy_price = open_positions.pop(symbol, None)
+                if buy_price is not None:
                     pnl = (price - buy_price) * size
                     total_pnl += pnl
                     
                     # Send performance alert
-                    dispatcher.send_custom_alert(
-                        f"Trade completed: {symbol} P&L: ${pnl:.2f}"
-                    )
+                    dispatcher.send_structured_alert('pnl', symbol=symbol, pnl=pnl)
         
         # Send summary performance alert
-        dispatcher.send_custom_alert(f"Total P&L: ${total_pnl:.2f}")
+        dispatcher.send_structured_alert('pnl_total', pnl=total_pnl)
         
         # Verify performance tracking
         alerts = dispatcher.get_alerts_history()
-        trade_alerts = [a for a in alerts if a.get('action') in ['BUY', 'SELL']]
-        performance_alerts = [a for a in alerts if 'P&L' in a.get('message', '')]
-        
-        assert len(trade_alerts) == 6, "Expected 6 trade alerts"
-        assert len(performance_alerts) > 0, "Expected performance alerts"
-        
-        print(f"   Total trades: {len(trade_alerts)}")
-        print(f"   Performance alerts: {len(performance_alerts)}")
-        print(f"   Total P&L: ${total_pnl:.2f}")
+        trade_alerts = [a for a in alerts if a.get('action') in TRADE_ACTIONS]
+        performance_alerts = dispatcher.get_alerts_by_type('pnl')
+        summary_alerts = dispatcher.get_alerts_by_type('pnl_total')
+        
+        assert len(trade_alerts) == 6, f"Expected 6 trade alerts, got {len(trade_alerts)}"
+        assert len(performance_alerts) == 3, f"Expected 3 performance alerts, got {len(performance_alerts)}"
+        assert summary_alerts[-1]['pnl'] == sum(a['pnl'] for a in performance_alerts), (
+            f"Summary P&L ${summary_alerts[-1]['pnl']:.2f} does not match the trades"
+        )
         
         print("✅ Strategy performance tracking working")
 
 class TestRealTimeSimulation(unittest.TestCase):
     """Test real-time strategy simulation"""
     
+    @classmethod
+    def setUpClass(cls):
+        # One dispatcher for the class, emptied before each test
+        cls.dispatcher = ConsoleDispatcher()
+    
+    def setUp(self):
+        self.dispatcher.clear_history()
+    
     def test_real_time_alert_flow(self):
         """Test real-time alert flow simulation"""
         print("\n⏰ Testing: Real-Time Alert Flow")
         
-        from src.alerts.console_dispatcher import ConsoleDispatcher
-        import time
-        
-        dispatcher = ConsoleDispatcher()
+        dispatcher = self.dispatcher
         
         # Simulate real-time price updates and alerts
         prices = [100, 101, 99, 102, 98, 105, 95, 108]
         symbol = "BTC-USD"
         
-        for i, price in enumerate(prices):
-            # Simulate price-based alerts
-            if i > 0:
-                prev_price = prices[i-1]
-                change_pct = ((price - prev_price) / prev_price) * 100
-                
-                if abs(change_pct) > 2:  # Significant price move
-                    direction = "UP" if change_pct > 0 else "DOWN"
-                    dispatcher.send_custom_alert(
-                        f"Price Alert: {symbol} moved {direction} {abs(change_pct):.1f}% "
-                        f"from ${prev_price:.2f} to ${price:.2f}"
-                    )
+        # Simulate price-based alerts on each consecutive pair of prices
+        for prev_price, price in zip(prices, prices[1:]):
+            change_pct = ((price - prev_price) / prev_price) * 100
             
-            # Small delay to simulate real-time
-            time.sleep(0.01)
+            if abs(change_pct) > 2:  # Significant price move
+                direction = "UP" if change_pct > 0 else "DOWN"
+                dispatcher.send_custom_alert(
+                    f"Price Alert: {symbol} moved {direction} {abs(change_pct):.1f}% "
+                    f"from ${prev_price:.2f} to ${price:.2f}"
+                )
         
         # Verify real-time alerts
         alerts = dispatcher.get_alerts_history()
         price_alerts = [a for a in alerts if 'Price Alert' in a.get('message', '')]
         
         assert len(price_alerts) > 0, "No price alerts generated"
-        print(f"   Price alerts generated: {len(price_alerts)}")
         
         print("✅ Real-time alert flow working")
     
@@ -324,9 +305,7 @@ class TestRealTimeSimulation(unittest.TestCase):
         """Test aggregation of strategy signals"""
         print("\n📊 Testing: Strategy Signal Aggregation")
         
-        from src.alerts.console_dispatcher import ConsoleDispatcher
-        
-        dispatcher = ConsoleDispatcher()
+        dispatcher = self.dispatcher
         
         # Simulate multiple strategy signals
         signals = [
@@ -344,43 +323,48 @@ class TestRealTimeSimulation(unittest.TestCase):
         assert len(strategy_alerts) == 4, "Expected 4 strategy signals"
         
         # Group by symbol
-        btc_signals = [s for s in strategy_alerts if s.get('symbol') == 'BTC-USD']
-        eth_signals = [s for s in strategy_alerts if s.get('symbol') == 'ETH-USD']
+        btc_signals = [s for s in strategy_alerts if s['symbol'] == 'BTC-USD']
+        eth_signals = [s for s in strategy_alerts if s['symbol'] == 'ETH-USD']
         
         assert len(btc_signals) == 3, "Expected 3 BTC signals"
         assert len(eth_signals) == 1, "Expected 1 ETH signal"
         
         # Check signal consensus
-        btc_buy_signals = [s for s in btc_signals if s.get('signal') == 'BUY']
-        print(f"   BTC consensus: {len(btc_buy_signals)}/3 strategies bullish")
+        btc_buy_signals = [s for s in btc_signals if s['signal'] == 'BUY']
+        assert len(btc_buy_signals) == 2, f"BTC consensus: {len(btc_buy_signals)}/3 strategies bullish"
         
         print("✅ Strategy signal aggregation working")
 
 class TestAlertReliability(unittest.TestCase):
     """Test alert system reliability"""
     
+    @classmethod
+    def setUpClass(cls):
+        # One dispatcher for the class, emptied before each test
+        cls.dispatcher = ConsoleDispatcher()
+    
+    def setUp(self):
+        self.dispatcher.clear_history()
+    
     def test_alert_delivery_reliability(self):
         """Test alert delivery under various conditions"""
         print("\n🔔 Testing: Alert Delivery Reliability")
         
-        from src.alerts.console_dispatcher import ConsoleDispatcher
-        
-        dispatcher = ConsoleDispatcher()
+        dispatcher = self.dispatcher
         
         # Test various alert types
         alert_tests = [
-            ('send_alert', ['BUY', 'AAPL', 150.50, 10]),
-            ('send_custom_alert', ['Custom message test']),
-            ('send_strategy_signal', ['TestStrategy', 'BUY', 'AAPL', ['Condition 1']]),
-            ('send_error_alert', ['TEST_ERROR', 'Test error message']),
+            (dispatcher.send_alert, ['BUY', 'AAPL', 150.50, 10]),
+            (dispatcher.send_custom_alert, ['Custom message test']),
+            (dispatcher.send_strategy_signal, ['TestStrategy', 'BUY', 'AAPL', ['Condition 1']]),
+            (dispatcher.send_error_alert, ['TEST_ERROR', 'Test error message']),
         ]
         
-        for method_name, args in alert_tests:
-            method = getattr(dispatcher, method_name)
+        for method, args in alert_tests:
             try:
                 method(*args)
             except Exception as e:
-                self.fail(f"Alert method {method_name} failed: {e}")
+                self.fail(f"Alert method {method.__name__} failed: {e}")
         
         # Verify all alerts were delivered
         total_alerts = len(dispatcher.get_alerts_history())
@@ -392,22 +376,21 @@ class TestAlertReliability(unittest.TestCase):
         """Test alert history maintains integrity"""
         print("\n📚 Testing: Alert History Integrity")
         
-        from src.alerts.console_dispatcher import ConsoleDispatcher
+        dispatcher = self.dispatcher
         
-        dispatcher = ConsoleDispatcher()
-        
-        # Send series of alerts
+        # Send series of alerts one at a time, so each gets its own timestamp
         for i in range(10):
-            dispatcher.send_alert('BUY' if i % 2 == 0 else 'SELL', 
-                                f'SYMBOL-{i}', 100 + i, 1.0)
+            dispatcher.send_alert('BUY' if i % 2 == 0 else 'SELL', f'SYMBOL-{i}', 100 + i, 1.0)
         
         # Verify history integrity
         history = dispatcher.get_alerts_history()
         assert len(history) == 10, "History count mismatch"
         
         # Verify chronological order
-        timestamps = [alert['timestamp'] for alert in history]
-        assert timestamps == sorted(timestamps), "Alerts not in chronological order"
+        timestamps = np.array([alert['timestamp'] for alert in history], dtype='datetime64[s]')
+        assert np.all(np.diff(timestamps) >= np.timedelta64(0)), "Alerts not in chronological order"
+        assert [alert['symbol'] for alert in history] == [f'SYMBOL-{i}' for i in range(10)], \
+            "Alerts not kept in send order"
         
         # Test filtering
         buy_alerts = dispatcher.get_alerts_by_type('BUY')
@@ -416,15 +399,10 @@ class TestAlertReliability(unittest.TestCase):
         assert len(buy_alerts) == 5, "Expected 5 BUY alerts"
         assert len(sell_alerts) == 5, "Expected 5 SELL alerts"
         
-        # Test export functionality
-        export_file = dispatcher.export_alerts('test_export.json')
-        assert export_file is not None, "Export failed"
-        
-        # Cleanup
-        try:
-            os.remove(export_file)
-        except:
-            pass
+        # Test export functionality (to a private directory so parallel workers never collide)
+        with tempfile.TemporaryDirectory() as export_dir:
+            export_file = dispatcher.export_alerts(os.path.join(export_dir, 'test_export.json'))
+            assert export_file is not None, "Export failed"
         
         print("✅ Alert history integrity confirmed")
 
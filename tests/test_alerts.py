@@ -1,18 +1,36 @@
 import unittest
 import asyncio
+from datetime import datetime
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.alerts.telegram_dispatcher import TelegramDispatcher
+from src.alerts.console_dispatcher import ConsoleDispatcher
 
 class TestTelegramDispatcher(unittest.TestCase):
     
+    @classmethod
+    def setUpClass(cls):
+        # One event loop for the tests that await the dispatcher directly
+        cls.loop = asyncio.new_event_loop()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.close()
+    
     def setUp(self):
         self.bot_token = "test_bot_token"
         self.chat_id = "test_chat_id"
         self.dispatcher = TelegramDispatcher(self.bot_token, self.chat_id)
+        # The real asyncio.run path executes; the bot records what would be sent
+        self.dispatcher.bot = AsyncMock()
+    
+    def sent_text(self):
+        """Text of the single message handed to the bot"""
+        self.dispatcher.bot.send_message.assert_awaited_once()
+        return self.dispatcher.bot.send_message.call_args.kwargs['text']
     
     def test_initialization(self):
         """Test TelegramDispatcher initialization"""
@@ -31,51 +49,40 @@ class TestTelegramDispatcher(unittest.TestCase):
         mock_bot_class.assert_called_once_with(token="token")
         self.assertEqual(dispatcher.bot, mock_bot)
     
-    @patch.object(TelegramDispatcher, '_send_message')
-    @patch('asyncio.run')
-    def test_send_alert(self, mock_asyncio_run, mock_send_message):
+    def test_send_alert(self):
         """Test sending a trading alert"""
         self.dispatcher.send_alert("BUY", "BTC-USD", 50000.0, 0.1)
         
-        # Check that asyncio.run was called
-        mock_asyncio_run.assert_called_once()
-        
-        # Get the coroutine that was passed to asyncio.run
-        called_args = mock_asyncio_run.call_args[0]
-        self.assertEqual(len(called_args), 1)
+        self.dispatcher.bot.send_message.assert_awaited_once()
+        self.assertEqual(self.dispatcher.bot.send_message.call_args.kwargs['chat_id'], self.chat_id)
     
-    @patch.object(TelegramDispatcher, '_send_message')
-    @patch('asyncio.run')
-    def test_send_alert_without_size(self, mock_asyncio_run, mock_send_message):
+    def test_send_alert_without_size(self):
         """Test sending alert without size parameter"""
         self.dispatcher.send_alert("SELL", "ETH-USD", 3000.0)
         
-        mock_asyncio_run.assert_called_once()
+        text = self.sent_text()
+        self.assertIn("SELL ALERT", text)
+        self.assertNotIn("Size:", text)
     
-    @patch.object(TelegramDispatcher, '_send_message')
-    @patch('asyncio.run')
-    def test_send_custom_alert(self, mock_asyncio_run, mock_send_message):
+    def test_send_custom_alert(self):
         """Test sending custom alert message"""
         custom_message = "Custom trading alert message"
         self.dispatcher.send_custom_alert(custom_message)
         
-        mock_asyncio_run.assert_called_once()
+        self.assertIn(custom_message, self.sent_text())
     
-    @patch('asyncio.run')
-    def test_send_alert_exception_handling(self, mock_asyncio_run):
+    @patch.object(TelegramDispatcher, '_send_message', side_effect=Exception("Network error"))
+    def test_send_alert_exception_handling(self, mock_send_message):
         """Test exception handling in send_alert"""
-        mock_asyncio_run.side_effect = Exception("Network error")
-        
         # Should not raise exception
         try:
             self.dispatcher.send_alert("BUY", "BTC-USD", 50000.0)
         except Exception:
             self.fail("send_alert should handle exceptions gracefully")
     
-    @patch('asyncio.run')
-    def test_send_custom_alert_exception_handling(self, mock_asyncio_run):
+    @patch.object(TelegramDispatcher, '_send_message', side_effect=Exception("Network error"))
+    def test_send_custom_alert_exception_handling(self, mock_send_message):
         """Test exception handling in send_custom_alert"""
-        mock_asyncio_run.side_effect = Exception("Network error")
         
         # Should not raise exception
         try:
@@ -88,82 +95,65 @@ class TestTelegramDispatcher(unittest.TestCase):
         time_str = self.dispatcher._get_current_time()
         
         self.assertIsInstance(time_str, str)
-        # Should match format YYYY-MM-DD HH:MM:SS
-        import re
-        pattern = r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}'
-        self.assertIsNotNone(re.match(pattern, time_str))
-    
-    @patch.object(TelegramDispatcher, '_send_message')
-    @patch('asyncio.run')
-    def test_test_connection_success(self, mock_asyncio_run, mock_send_message):
+        # Should parse as YYYY-MM-DD HH:MM:SS
+        try:
+            datetime.strptime(time_str, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            self.fail(f"Unexpected time format: {time_str}")
+    
+    def test_test_connection_success(self):
         """Test successful connection test"""
-        mock_asyncio_run.return_value = None  # Successful execution
-        
         result = self.dispatcher.test_connection()
         
         self.assertTrue(result)
-        mock_asyncio_run.assert_called_once()
+        self.assertIn("Connection successful", self.sent_text())
     
-    @patch('asyncio.run')
-    def test_test_connection_failure(self, mock_asyncio_run):
+    @patch.object(TelegramDispatcher, '_send_message', side_effect=Exception("Connection failed"))
+    def test_test_connection_failure(self, mock_send_message):
         """Test failed connection test"""
-        mock_asyncio_run.side_effect = Exception("Connection failed")
-        
         result = self.dispatcher.test_connection()
         
         self.assertFalse(result)
     
-    async def test_send_message_async(self):
+    def test_send_message_async(self):
         """Test async message sending"""
-        # Mock the bot's send_message method
-        mock_bot = AsyncMock()
-        self.dispatcher.bot = mock_bot
+        self.loop.run_until_complete(self.dispatcher._send_message("Test message"))
         
-        await self.dispatcher._send_message("Test message")
-        
-        mock_bot.send_message.assert_called_once_with(
+        self.dispatcher.bot.send_message.assert_awaited_once_with(
             chat_id=self.chat_id,
             text="Test message"
         )
     
-    async def test_send_message_async_exception(self):
+    def test_send_message_async_exception(self):
         """Test async message sending with exception"""
-        # Mock the bot to raise an exception
-        mock_bot = AsyncMock()
-        mock_bot.send_message.side_effect = Exception("API error")
-        self.dispatcher.bot = mock_bot
+        # Make the bot raise an exception
+        self.dispatcher.bot.send_message.side_effect = Exception("API error")
         
         # Should not raise exception
         try:
-            await self.dispatcher._send_message("Test message")
+            self.loop.run_until_complete(self.dispatcher._send_message("Test message"))
         except Exception:
             self.fail("_send_message should handle exceptions gracefully")
     
     def test_alert_message_format(self):
         """Test alert message formatting"""
-        # We'll test this by mocking the _send_message and checking the message content
-        with patch.object(self.dispatcher, '_send_message') as mock_send:
-            with patch('asyncio.run') as mock_run:
-                # Capture the message that would be sent
-                def capture_message(coro):
-                    # Extract the message from the coroutine
-                    return coro
-                
-                mock_run.side_effect = capture_message
-                
-                self.dispatcher.send_alert("BUY", "BTC-USD", 50000.0, 0.1)
-                
-                # Verify asyncio.run was called
-                mock_run.assert_called_once()
+        self.dispatcher.send_alert("BUY", "BTC-USD", 50000.0, 0.1)
+        
+        text = self.sent_text()
+        self.assertTrue(text.startswith("🚨 BUY ALERT 🚨"))
+        self.assertIn("Symbol: BTC-USD", text)
+        self.assertIn("Price: $50000.00", text)
+        self.assertIn("Size: 0.1000", text)
+        self.assertIn("⏰ Time:", text)
     
     def test_custom_alert_message_format(self):
         """Test custom alert message formatting"""
-        with patch.object(self.dispatcher, '_send_message') as mock_send:
-            with patch('asyncio.run') as mock_run:
-                custom_msg = "RSI crossed below 30"
-                self.dispatcher.send_custom_alert(custom_msg)
-                
-                mock_run.assert_called_once()
+        custom_msg = "RSI crossed below 30"
+        self.dispatcher.send_custom_alert(custom_msg)
+        
+        text = self.sent_text()
+        self.assertTrue(text.startswith("🤖 Backtrader Alert"))
+        self.assertIn(custom_msg, text)
     
     @patch('telegram.Bot')
     def test_different_initialization_params(self, mock_bot_class):
@@ -183,17 +173,18 @@ class TestTelegramDispatcherIntegration(unittest.TestCase):
     def setUp(self):
         # Use fake credentials for testing
         self.dispatcher = TelegramDispatcher("fake_token", "fake_chat_id")
+        self.dispatcher.bot = AsyncMock()
     
     def test_message_content_generation(self):
         """Test that alert messages are properly formatted"""
         # Test BUY alert format
-        with patch('asyncio.run') as mock_run:
-            self.dispatcher.send_alert("BUY", "BTC-USD", 50000.0, 0.1)
-            
-            # Get the coroutine that was passed to asyncio.run
-            call_args = mock_run.call_args[0][0]
-            # The message should contain the expected elements
-            mock_run.assert_called_once()
+        self.dispatcher.send_alert("BUY", "BTC-USD", 50000.0, 0.1)
+        
+        # The message should contain the expected elements
+        self.dispatcher.bot.send_message.assert_awaited_once()
+        text = self.dispatcher.bot.send_message.call_args.kwargs['text']
+        self.assertIn("BUY ALERT", text)
+        self.assertIn("BTC-USD", text)
     
     def test_error_resilience(self):
         """Test that the system handles various error conditions"""
@@ -209,5 +200,96 @@ class TestTelegramDispatcherIntegration(unittest.TestCase):
         except Exception as e:
             self.fail(f"Should handle empty values gracefully: {e}")
 
+class TestConsoleDispatcher(unittest.TestCase):
+    """History bounds and the per-type index of ConsoleDispatcher"""
+    
+    def assertIndexInSync(self, dispatcher):
+        """get_alerts_by_type must agree with get_alerts_history for every type"""
+        history = dispatcher.get_alerts_history()
+        for alert_type in ('BUY', 'SELL', 'custom', 'error', 'strategy_signal'):
+            expected = [alert for alert in history
+                        if alert_type in (alert.get('type'), alert.get('action'))]
+            self.assertEqual(dispatcher.get_alerts_by_type(alert_type), expected, alert_type)
+    
+    def test_eviction_keeps_index_in_sync(self):
+        """Overflowing max_history with mixed alert types"""
+        dispatcher = ConsoleDispatcher(max_history=5)
+        
+        for i in range(4):
+            dispatcher.send_alert("BUY", "AAPL", 100.0 + i)
+            dispatcher.send_custom_alert(f"message {i}")
+            dispatcher.send_error_alert("DATA_ERROR", f"error {i}")
+        dispatcher.send_strategy_signal("RSI_Strategy", "SELL", "AAPL")
+        
+        history = dispatcher.get_alerts_history()
+        self.assertEqual(len(history), 5)
+        self.assertEqual(history[-1]['type'], 'strategy_signal')
+        self.assertIndexInSync(dispatcher)
+    
+    def test_bulk_batch_longer_than_history(self):
+        """A send_alerts_bulk batch longer than max_history keeps only its tail"""
+        dispatcher = ConsoleDispatcher(max_history=3)
+        dispatcher.send_custom_alert("before the batch")
+        
+        records = [("BUY" if i % 2 else "SELL", "AAPL", 100.0 + i, None) for i in range(7)]
+        self.assertEqual(dispatcher.send_alerts_bulk(records), 7)
+        
+        history = dispatcher.get_alerts_history()
+        self.assertEqual([alert['price'] for alert in history], [104.0, 105.0, 106.0])
+        self.assertEqual(dispatcher.get_alerts_by_type('custom'), [])
+        self.assertIndexInSync(dispatcher)
+    
+    def test_send_structured_alert(self):
+        """Structured alerts keep their fields and are filed under their kind"""
+        dispatcher = ConsoleDispatcher()
+        
+        dispatcher.send_structured_alert('pnl', symbol='AAPL', pnl=12.5)
+        
+        alerts = dispatcher.get_alerts_by_type('pnl')
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(alerts[0]['symbol'], 'AAPL')
+        self.assertEqual(alerts[0]['pnl'], 12.5)
+        self.assertIn('timestamp', alerts[0])
+        self.assertEqual(dispatcher.get_alerts_count(), {'pnl': 1})
+    
+    def test_send_structured_alert_reserved_fields(self):
+        """Fields may not override the alert's type or timestamp"""
+        dispatcher = ConsoleDispatcher()
+        
+        with self.assertRaises(ValueError):
+            dispatcher.send_structured_alert('pnl', type='other')
+        with self.assertRaises(ValueError):
+            dispatcher.send_structured_alert('pnl', timestamp='2000-01-01 00:00:00')
+        
+        self.assertEqual(dispatcher.get_alerts_history(), [])
+    
+    def test_structured_alert_found_by_action(self):
+        """Structured alerts with an action field are also filed under the action"""
+        dispatcher = ConsoleDispatcher(max_history=2)
+        
+        dispatcher.send_structured_alert('fill', action='BUY', symbol='AAPL')
+        dispatcher.send_alert('BUY', 'AAPL', 150.0)
+        
+        self.assertEqual(len(dispatcher.get_alerts_by_type('fill')), 1)
+        self.assertEqual(len(dispatcher.get_alerts_by_type('BUY')), 2)
+        
+        # Evicting the structured alert drops it from both keys
+        dispatcher.send_custom_alert('done')
+        self.assertEqual(dispatcher.get_alerts_by_type('fill'), [])
+        self.assertEqual(len(dispatcher.get_alerts_by_type('BUY')), 1)
+        self.assertIndexInSync(dispatcher)
+    
+    def test_unbounded_history(self):
+        """max_history=None keeps every alert"""
+        dispatcher = ConsoleDispatcher(max_history=None)
+        
+        dispatcher.send_alert("BUY", "AAPL", 100.0)
+        dispatcher.send_alerts_bulk([("SELL", "AAPL", 101.0, 1.0)] * 3)
+        dispatcher.send_custom_alert("message")
+        
+        self.assertEqual(len(dispatcher.get_alerts_history()), 5)
+        self.assertEqual(len(dispatcher.get_alerts_by_type('SELL')), 3)
+        self.assertIndexInSync(dispatcher)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,10 +1,15 @@
 import unittest
 import tempfile
+import copy
+import io
 import os
 import yaml
 from unittest.mock import patch, mock_open
 import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Project root on the path for direct and unittest runs; pytest already adds it
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
 from src.config.config_manager import ConfigManager
 from src.config.indicators_config import (
@@ -12,10 +17,17 @@ from src.config.indicators_config import (
     get_indicator_categories, get_indicator_params, get_indicator_lines
 )
 
+# Python type expected for each indicator param 'type'
+PARAM_TYPES = {'int': int, 'float': float}
+
+# Write fixtures with libyaml when available, like ConfigManager does
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 class TestConfigManager(unittest.TestCase):
     
-    def setUp(self):
-        self.test_config = {
+    @classmethod
+    def setUpClass(cls):
+        cls.test_config = {
             'telegram': {
                 'bot_token': 'test_token',
                 'chat_id': 'test_chat_id'
@@ -28,11 +40,21 @@ class TestConfigManager(unittest.TestCase):
                 'default_source': 'yfinance'
             }
         }
+        
+        # Serialize the fixture once; tests that need YAML text reuse it
+        cls._test_config_yaml = yaml.dump(cls.test_config, Dumper=YAML_DUMPER)
+        
+        # Load the fixture once from memory; read-only tests share this manager
+        cls._base_cm = ConfigManager(stream=io.StringIO(cls._test_config_yaml))
+    
+    def fresh_manager(self):
+        """Private copy of the fixture config for tests that modify it"""
+        return ConfigManager.from_dict(copy.deepcopy(self._base_cm.config))
     
     def test_init_with_valid_config_file(self):
         """Test initialization with a valid config file"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(self.test_config, f)
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.yaml', delete=False) as f:
+            f.write(self._test_config_yaml.encode())
             temp_path = f.name
         
         try:
@@ -42,6 +64,27 @@ class TestConfigManager(unittest.TestCase):
         finally:
             os.unlink(temp_path)
     
+    def test_init_with_stream(self):
+        """Test initialization from an in-memory YAML stream"""
+        config_manager = self._base_cm
+        
+        # No file is involved
+        self.assertIsNone(config_manager.config_path)
+        self.assertEqual(config_manager.config, self.test_config)
+    
+    def test_from_dict(self):
+        """Test initialization from an in-memory config dict"""
+        config = copy.deepcopy(self.test_config)
+        
+        with patch('builtins.open') as mocked_open:
+            config_manager = ConfigManager.from_dict(config)
+        
+        # Nothing is read and the dict is used as-is
+        mocked_open.assert_not_called()
+        self.assertIsNone(config_manager.config_path)
+        self.assertIs(config_manager.config, config)
+        self.assertEqual(config_manager.get('telegram.bot_token'), self.test_config['telegram']['bot_token'])
+    
     def test_init_with_nonexistent_file(self):
         """Test initialization with non-existent config file"""
         config_manager = ConfigManager('/nonexistent/path/config.yaml')
@@ -71,8 +114,7 @@ class TestConfigManager(unittest.TestCase):
     
     def test_get_default_config(self):
         """Test default configuration structure"""
-        config_manager = ConfigManager()
-        default_config = config_manager.get_default_config()
+        default_config = self._base_cm.get_default_config()
         
         self.assertIsInstance(default_config, dict)
         self.assertIn('telegram', default_config)
@@ -90,23 +132,16 @@ class TestConfigManager(unittest.TestCase):
     
     def test_get_simple_key(self):
         """Test getting simple configuration values"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(self.test_config, f)
-            temp_path = f.name
+        config_manager = self._base_cm
         
-        try:
-            config_manager = ConfigManager(temp_path)
-            
-            # Test getting nested values with dot notation
-            self.assertEqual(config_manager.get('telegram.bot_token'), 'test_token')
-            self.assertEqual(config_manager.get('trading.initial_cash'), 10000)
-            self.assertEqual(config_manager.get('data.default_source'), 'yfinance')
-        finally:
-            os.unlink(temp_path)
+        # Test getting nested values with dot notation
+        self.assertEqual(config_manager.get('telegram.bot_token'), 'test_token')
+        self.assertEqual(config_manager.get('trading.initial_cash'), 10000)
+        self.assertEqual(config_manager.get('data.default_source'), 'yfinance')
     
     def test_get_nonexistent_key(self):
         """Test getting non-existent configuration key"""
-        config_manager = ConfigManager()
+        config_manager = self._base_cm
         
         # Should return default value
         self.assertIsNone(config_manager.get('nonexistent.key'))
@@ -114,7 +149,7 @@ class TestConfigManager(unittest.TestCase):
     
     def test_set_simple_key(self):
         """Test setting configuration values"""
-        config_manager = ConfigManager()
+        config_manager = self.fresh_manager()
         
         config_manager.set('telegram.bot_token', 'new_token')
         self.assertEqual(config_manager.get('telegram.bot_token'), 'new_token')
@@ -124,14 +159,14 @@ class TestConfigManager(unittest.TestCase):
     
     def test_set_new_nested_key(self):
         """Test setting new nested configuration key"""
-        config_manager = ConfigManager()
+        config_manager = self.fresh_manager()
         
         config_manager.set('new.nested.key', 'value')
         self.assertEqual(config_manager.get('new.nested.key'), 'value')
     
     def test_update_from_dict(self):
         """Test updating configuration from dictionary"""
-        config_manager = ConfigManager()
+        config_manager = self.fresh_manager()
         
         updates = {
             'telegram': {
@@ -153,7 +188,7 @@ class TestConfigManager(unittest.TestCase):
     
     def test_validate_config_valid(self):
         """Test configuration validation with valid config"""
-        config_manager = ConfigManager()
+        config_manager = self.fresh_manager()
         config_manager.set('telegram.bot_token', 'valid_token')
         config_manager.set('telegram.chat_id', 'valid_chat_id')
         config_manager.set('trading.initial_cash', 10000)
@@ -163,7 +198,7 @@ class TestConfigManager(unittest.TestCase):
     
     def test_validate_config_missing_chat_id(self):
         """Test configuration validation with missing chat ID"""
-        config_manager = ConfigManager()
+        config_manager = self.fresh_manager()
         config_manager.set('telegram.bot_token', 'valid_token')
         config_manager.set('telegram.chat_id', '')  # Empty chat ID
         
@@ -171,21 +206,21 @@ class TestConfigManager(unittest.TestCase):
     
     def test_validate_config_invalid_cash(self):
         """Test configuration validation with invalid initial cash"""
-        config_manager = ConfigManager()
+        config_manager = self.fresh_manager()
         config_manager.set('trading.initial_cash', 0)  # Invalid: should be positive
         
         self.assertFalse(config_manager.validate_config())
     
     def test_validate_config_invalid_commission(self):
         """Test configuration validation with invalid commission"""
-        config_manager = ConfigManager()
+        config_manager = self.fresh_manager()
         config_manager.set('trading.commission', 1.5)  # Invalid: should be between 0 and 1
         
         self.assertFalse(config_manager.validate_config())
     
     def test_dictionary_style_access(self):
         """Test dictionary-style access to configuration"""
-        config_manager = ConfigManager()
+        config_manager = self.fresh_manager()
         
         # Test getitem
         value = config_manager['trading.initial_cash']
@@ -215,20 +250,14 @@ class TestConfigManager(unittest.TestCase):
     
     def test_save_specific_config(self):
         """Test saving specific configuration dictionary"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            temp_path = f.name
+        config_manager = self.fresh_manager()
         
-        try:
-            config_manager = ConfigManager(temp_path)
-            
-            custom_config = {'custom': {'key': 'value'}}
-            config_manager.save_config(custom_config)
-            
-            # Load and verify
-            new_config_manager = ConfigManager(temp_path)
-            self.assertEqual(new_config_manager.get('custom.key'), 'value')
-        finally:
-            os.unlink(temp_path)
+        custom_config = {'custom': {'key': 'value'}}
+        output = io.StringIO()
+        config_manager.save_config(custom_config, stream=output)
+        
+        # Verify the written YAML directly
+        self.assertEqual(output.getvalue(), "custom:\n  key: value\n")
 
 class TestIndicatorsConfig(unittest.TestCase):
     
@@ -336,13 +365,8 @@ class TestIndicatorsConfig(unittest.TestCase):
                 self.assertIn('type', param_config)
                 
                 # Check type consistency
-                param_type = param_config['type']
-                param_default = param_config['default']
-                
-                if param_type == 'int':
-                    self.assertIsInstance(param_default, int)
-                elif param_type == 'float':
-                    self.assertIsInstance(param_default, float)
+                self.assertIn(param_config['type'], PARAM_TYPES)
+                self.assertIsInstance(param_config['default'], PARAM_TYPES[param_config['type']])
     
     def test_indicator_ranges(self):
         """Test indicator ranges are properly defined"""
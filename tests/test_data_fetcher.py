@@ -1,27 +1,45 @@
 import unittest
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch, MagicMock
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Project root on the path for direct and unittest runs; pytest already adds it
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
 from src.data.fetcher import DataFetcher
 
+class _FakeTicker:
+    """Stand-in for yfinance.Ticker whose history() returns a fixed frame"""
+    __slots__ = ('_df',)
+    
+    def __init__(self, df):
+        self._df = df
+    
+    def history(self, *args, **kwargs):
+        return self._df
+
 class TestDataFetcher(unittest.TestCase):
     
-    def setUp(self):
-        self.fetcher_yf = DataFetcher(data_source='yfinance')
-        self.fetcher_binance = DataFetcher(data_source='binance')
-        
-        # Sample data for testing
-        self.sample_data = pd.DataFrame({
+    SAMPLE_INDEX = pd.date_range('2023-01-01', periods=5, freq='D')
+    
+    @classmethod
+    def setUpClass(cls):
+        # Sample data for testing; built once and only read by the tests
+        cls.sample_data = pd.DataFrame({
             'open': [100, 101, 102, 103, 104],
             'high': [105, 106, 107, 108, 109],
             'low': [95, 96, 97, 98, 99],
             'close': [102, 103, 104, 105, 106],
             'volume': [1000, 1100, 1200, 1300, 1400]
-        }, index=pd.date_range('2023-01-01', periods=5, freq='D'))
+        }, index=cls.SAMPLE_INDEX)
+    
+    def setUp(self):
+        self.fetcher_yf = DataFetcher(data_source='yfinance')
+        self.fetcher_binance = DataFetcher(data_source='binance')
     
     def test_init_yfinance(self):
         """Test initialization with yfinance data source"""
@@ -44,11 +62,9 @@ class TestDataFetcher(unittest.TestCase):
     def test_fetch_yfinance_data_success(self, mock_ticker):
         """Test successful data fetching from yfinance"""
         # Mock the yfinance response
-        mock_instance = Mock()
-        mock_data = self.sample_data.copy()
+        mock_data = self.sample_data.copy(deep=False)  # Private frame; only its labels change
         mock_data.columns = mock_data.columns.str.lower()  # Ensure lowercase
-        mock_instance.history.return_value = mock_data
-        mock_ticker.return_value = mock_instance
+        mock_ticker.return_value = _FakeTicker(mock_data)
         
         result = self.fetcher_yf.fetch_data('AAPL', '1d', '2023-01-01', '2023-01-31')
         
@@ -66,9 +82,7 @@ class TestDataFetcher(unittest.TestCase):
     def test_fetch_yfinance_data_empty(self, mock_ticker):
         """Test fetching empty data from yfinance"""
         # Mock empty response
-        mock_instance = Mock()
-        mock_instance.history.return_value = pd.DataFrame()
-        mock_ticker.return_value = mock_instance
+        mock_ticker.return_value = _FakeTicker(pd.DataFrame())
         
         result = self.fetcher_yf.fetch_data('INVALID', '1d', '2023-01-01', '2023-01-31')
         
@@ -84,6 +98,22 @@ class TestDataFetcher(unittest.TestCase):
         
         self.assertIsNone(result)
     
+    @patch('yfinance.download')
+    def test_fetch_many_yfinance(self, mock_download):
+        """Test batched multi-symbol fetching from yfinance"""
+        # One download returns (symbol, field) columns for every symbol
+        mock_download.return_value = pd.concat({
+            'AAPL': self.sample_data.rename(columns=str.title),
+            'MSFT': self.sample_data.rename(columns=str.title)
+        }, axis=1)
+        
+        result = self.fetcher_yf.fetch_many(['AAPL', 'MSFT', 'GOOG'], '1d', '2023-01-01', '2023-01-31')
+        
+        mock_download.assert_called_once()
+        self.assertEqual(list(result), ['AAPL', 'MSFT'])  # GOOG had no data
+        self.assertEqual(list(result['AAPL'].columns), ['open', 'high', 'low', 'close', 'volume'])
+        self.assertEqual(len(result['MSFT']), len(self.sample_data))
+    
     def test_convert_interval_yfinance(self):
         """Test interval conversion for yfinance"""
         # Test standard intervals
@@ -103,7 +133,7 @@ class TestDataFetcher(unittest.TestCase):
             'low': [95, 96, 97, 98],
             'close': [102, 103, 104, 105],
             'volume': [1000, 1100, 1200, 1300]
-        }, index=pd.date_range('2023-01-01 00:00:00', periods=4, freq='H'))
+        }, index=pd.date_range('2023-01-01 00:00:00', periods=4, freq='h'))
         
         # Resample to 2h
         result = self.fetcher_yf.resample_data(hourly_data, '2h')
@@ -111,18 +141,18 @@ class TestDataFetcher(unittest.TestCase):
         self.assertIsInstance(result, pd.DataFrame)
         self.assertEqual(len(result), 2)  # 4 hours -> 2 2-hour periods
         
-        # Check OHLC aggregation
-        self.assertEqual(result.iloc[0]['open'], 100)  # First open
-        self.assertEqual(result.iloc[0]['high'], 106)  # Max high
-        self.assertEqual(result.iloc[0]['low'], 95)    # Min low
-        self.assertEqual(result.iloc[0]['close'], 103) # Last close
-        self.assertEqual(result.iloc[0]['volume'], 2100) # Sum volume
+        # Check OHLC aggregation on the raw column arrays
+        self.assertEqual(result['open'].to_numpy()[0], 100)  # First open
+        self.assertEqual(result['high'].to_numpy()[0], 106)  # Max high
+        self.assertEqual(result['low'].to_numpy()[0], 95)    # Min low
+        self.assertEqual(result['close'].to_numpy()[0], 103) # Last close
+        self.assertEqual(result['volume'].to_numpy()[0], 2100) # Sum volume
     
     @patch.object(DataFetcher, 'fetch_data')
     def test_fetch_multiple_timeframes(self, mock_fetch):
         """Test fetching multiple timeframes"""
         # Mock successful fetches
-        mock_fetch.side_effect = [self.sample_data, self.sample_data]
+        mock_fetch.return_value = self.sample_data
         
         result = self.fetcher_yf.fetch_multiple_timeframes(
             'BTC-USD', ['1h', '4h'], '2023-01-01', '2023-01-31'
@@ -137,8 +167,8 @@ class TestDataFetcher(unittest.TestCase):
     @patch.object(DataFetcher, 'fetch_data')
     def test_fetch_multiple_timeframes_partial_failure(self, mock_fetch):
         """Test fetching multiple timeframes with partial failure"""
-        # Mock one success, one failure
-        mock_fetch.side_effect = [self.sample_data, None]
+        # Mock one success, one failure (timeframes are fetched concurrently, in any order)
+        mock_fetch.side_effect = lambda symbol, interval, *args: self.sample_data if interval == '1h' else None
         
         result = self.fetcher_yf.fetch_multiple_timeframes(
             'BTC-USD', ['1h', '4h'], '2023-01-01', '2023-01-31'
@@ -149,14 +179,26 @@ class TestDataFetcher(unittest.TestCase):
         self.assertIn('1h', result)
         self.assertNotIn('4h', result)
     
+    @patch('src.data.fetcher.time.sleep')
+    @patch.object(DataFetcher, 'fetch_data')
+    def test_fetch_multiple_timeframes_binance_sequential(self, mock_fetch, mock_sleep):
+        """Test exchange timeframes are fetched one at a time with spacing"""
+        mock_fetch.return_value = self.sample_data
+        
+        result = self.fetcher_binance.fetch_multiple_timeframes(
+            'BTC/USDT', ['1h', '4h', '1d'], '2023-01-01', '2023-01-31'
+        )
+        
+        self.assertEqual(list(result), ['1h', '4h', '1d'])
+        self.assertEqual([c.args[1] for c in mock_fetch.call_args_list], ['1h', '4h', '1d'])
+        self.assertEqual(mock_sleep.call_count, 3)
+    
     @patch('yfinance.Ticker')
     def test_get_latest_price_yfinance(self, mock_ticker):
         """Test getting latest price from yfinance"""
         # Mock the response
-        mock_instance = Mock()
         mock_data = pd.DataFrame({'Close': [100.50]}, index=[datetime.now()])
-        mock_instance.history.return_value = mock_data
-        mock_ticker.return_value = mock_instance
+        mock_ticker.return_value = _FakeTicker(mock_data)
         
         result = self.fetcher_yf.get_latest_price('AAPL')
         
@@ -174,9 +216,7 @@ class TestDataFetcher(unittest.TestCase):
     @patch('yfinance.Ticker')
     def test_validate_symbol_yfinance_valid(self, mock_ticker):
         """Test symbol validation - valid symbol"""
-        mock_instance = Mock()
-        mock_instance.history.return_value = self.sample_data
-        mock_ticker.return_value = mock_instance
+        mock_ticker.return_value = _FakeTicker(self.sample_data)
         
         result = self.fetcher_yf.validate_symbol('AAPL')
         
@@ -185,14 +225,55 @@ class TestDataFetcher(unittest.TestCase):
     @patch('yfinance.Ticker')
     def test_validate_symbol_yfinance_invalid(self, mock_ticker):
         """Test symbol validation - invalid symbol"""
-        mock_instance = Mock()
-        mock_instance.history.return_value = pd.DataFrame()
-        mock_ticker.return_value = mock_instance
+        mock_ticker.return_value = _FakeTicker(pd.DataFrame())
         
         result = self.fetcher_yf.validate_symbol('INVALID')
         
         self.assertFalse(result)
     
+    @patch('yfinance.Ticker')
+    def test_validate_symbol_malformed(self, mock_ticker):
+        """Test symbol validation - malformed symbol skips the network"""
+        self.assertFalse(self.fetcher_yf.validate_symbol(''))
+        self.assertFalse(self.fetcher_yf.validate_symbol('NOT A SYMBOL'))
+        
+        mock_ticker.assert_not_called()
+    
+    def test_validate_symbol_binance_settle_currency(self):
+        """Test ccxt symbols with a settle currency reach the exchange"""
+        self.fetcher_binance.exchange.load_markets = MagicMock(return_value={'BTC/USDT:USDT': {}})
+        
+        self.assertTrue(self.fetcher_binance.validate_symbol('BTC/USDT:USDT'))
+    
+    @patch('yfinance.Ticker')
+    def test_get_ticker_scope(self, mock_ticker):
+        """Test Tickers are reused per fetcher and worker slot, never across them"""
+        mock_ticker.side_effect = lambda symbol: _FakeTicker(self.sample_data)
+        
+        ticker = self.fetcher_yf._get_ticker('AAPL')
+        self.assertIs(self.fetcher_yf._get_ticker('AAPL'), ticker)
+        self.assertIsNot(DataFetcher(data_source='yfinance')._get_ticker('AAPL'), ticker)
+        
+        # Pool threads reuse the cache, but concurrent slots get their own Ticker
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            self.assertIs(executor.submit(self.fetcher_yf._get_ticker, 'AAPL').result(), ticker)
+        self.fetcher_yf._ticker_slot.index = 1
+        self.assertIsNot(self.fetcher_yf._get_ticker('AAPL'), ticker)
+    
+    @patch('src.data.fetcher._TICKER_CACHE_SIZE', 2)
+    @patch('yfinance.Ticker')
+    def test_get_ticker_cache_bounded(self, mock_ticker):
+        """Test the Ticker cache drops the least recently used symbol"""
+        mock_ticker.side_effect = lambda symbol: _FakeTicker(self.sample_data)
+        
+        aapl = self.fetcher_yf._get_ticker('AAPL')
+        self.fetcher_yf._get_ticker('MSFT')
+        self.fetcher_yf._get_ticker('AAPL')
+        self.fetcher_yf._get_ticker('SPY')
+        
+        self.assertEqual(list(self.fetcher_yf._tickers), [('AAPL', 0), ('SPY', 0)])
+        self.assertIs(self.fetcher_yf._get_ticker('AAPL'), aapl)
+    
     def test_resample_data_exception(self):
         """Test resampling with invalid data"""
         invalid_data = pd.DataFrame({'invalid': [1, 2, 3]})
@@ -1,7 +1,10 @@
 import unittest
+import numpy as np
 import pandas as pd
 import backtrader as bt
 from datetime import datetime, timedelta
+from collections import defaultdict
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 import sys
 import os
@@ -9,20 +12,55 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.engine.backtrader_runner import BacktraderEngine
 from src.strategies.rsi_crossover import RSICrossoverStrategy
+from src.strategies.multi_timeframe import MultiTimeframeStrategy
+
+# Sample OHLCV columns, built once; backtrader only reads the frame
+_OPEN = np.arange(100, 110, dtype=np.float64)
+_HIGH = _OPEN + 5
+_LOW = _OPEN - 5
+_CLOSE = _OPEN + 2
+_VOLUME = np.arange(1000, 2000, 100, dtype=np.float64)
+_INDEX = pd.date_range('2023-01-01', periods=10, freq='D')
+_SAMPLE_DF = pd.DataFrame({
+    'open': _OPEN,
+    'high': _HIGH,
+    'low': _LOW,
+    'close': _CLOSE,
+    'volume': _VOLUME
+}, index=_INDEX, copy=False)
+
+class RoundTripStrategy(bt.Strategy):
+    """Buys one unit on the first bar and closes it two bars later"""
+    
+    def next(self):
+        if len(self) == 1:
+            self.buy(size=1)
+        elif len(self) == 3:
+            self.close()
 
 class TestBacktraderEngine(unittest.TestCase):
     
+    @classmethod
+    def setUpClass(cls):
+        cls.sample_data = _SAMPLE_DF
+        
+        # Results of shared RSI backtests, keyed by their strategy params
+        cls._backtest_results = {}
+    
     def setUp(self):
+        # Engines are cheap; a fresh one keeps cerebro state out of other tests
         self.engine = BacktraderEngine(initial_cash=10000, commission=0.001)
-        
-        # Create sample data
-        self.sample_data = pd.DataFrame({
-            'open': [100, 101, 102, 103, 104, 105, 106, 107, 108, 109],
-            'high': [105, 106, 107, 108, 109, 110, 111, 112, 113, 114],
-            'low': [95, 96, 97, 98, 99, 100, 101, 102, 103, 104],
-            'close': [102, 103, 104, 105, 106, 107, 108, 109, 110, 111],
-            'volume': [1000, 1100, 1200, 1300, 1400, 1500, 1600, 1700, 1800, 1900]
-        }, index=pd.date_range('2023-01-01', periods=10, freq='D'))
+    
+    def shared_backtest(self, strategy_params=None):
+        """RSICrossoverStrategy backtest on sample_data, run once per distinct params"""
+        key = frozenset((strategy_params or {}).items())
+        if key not in self._backtest_results:
+            self._backtest_results[key] = BacktraderEngine(initial_cash=10000, commission=0.001).run_backtest(
+                strategy_class=RSICrossoverStrategy,
+                data=self.sample_data,
+                strategy_params=dict(key)
+            )
+        return self._backtest_results[key]
     
     def test_engine_initialization(self):
         """Test engine initialization"""
@@ -48,11 +86,7 @@ class TestBacktraderEngine(unittest.TestCase):
             'rsi_overbought': 70
         }
         
-        results = self.engine.run_backtest(
-            strategy_class=RSICrossoverStrategy,
-            data=self.sample_data,
-            strategy_params=strategy_params
-        )
+        results = self.shared_backtest(strategy_params)
         
         # Check result structure
         self.assertIsInstance(results, dict)
@@ -92,19 +126,17 @@ class TestBacktraderEngine(unittest.TestCase):
     
     def test_run_backtest_no_params(self):
         """Test backtest without strategy parameters"""
-        results = self.engine.run_backtest(
-            strategy_class=RSICrossoverStrategy,
-            data=self.sample_data
-        )
+        results = self.shared_backtest()
         
         self.assertIsInstance(results, dict)
         self.assertEqual(results['initial_value'], 10000)
     
     def test_run_multi_timeframe_backtest(self):
         """Test multi-timeframe backtest"""
+        # PandasData only reads its dataframe, so both feeds can share one
         timeframe_data = {
-            '1h': self.sample_data.copy(),
-            '4h': self.sample_data.copy()
+            '1h': self.sample_data,
+            '4h': self.sample_data
         }
         
         timeframe_configs = {
@@ -135,8 +167,6 @@ class TestBacktraderEngine(unittest.TestCase):
             'conditions': conditions
         }
         
-        from src.strategies.multi_timeframe import MultiTimeframeStrategy
-        
         results = self.engine.run_multi_timeframe_backtest(
             strategy_class=MultiTimeframeStrategy,
             timeframe_data=timeframe_data,
@@ -159,8 +189,6 @@ class TestBacktraderEngine(unittest.TestCase):
             'conditions': []
         }
         
-        from src.strategies.multi_timeframe import MultiTimeframeStrategy
-        
         results = self.engine.run_multi_timeframe_backtest(
             strategy_class=MultiTimeframeStrategy,
             timeframe_data=timeframe_data,
@@ -172,27 +200,66 @@ class TestBacktraderEngine(unittest.TestCase):
     
     def test_extract_trades_empty(self):
         """Test trade extraction with no trades"""
-        # Create a minimal strategy for testing
-        cerebro = bt.Cerebro()
+        # _extract_trades only reads strategy._trades, so no Cerebro run is needed
+        strategy = SimpleNamespace(_trades=defaultdict(lambda: defaultdict(list)))
+        
+        self.assertEqual(self.engine._extract_trades(strategy), [])
+    
+    def test_extract_trades_closed_only(self):
+        """Test trade extraction keeps closed trades and their fields"""
+        # Trade history entries as recorded with Cerebro(tradehistory=True)
+        closed_trade = SimpleNamespace(
+            isclosed=True,
+            dtopen=bt.date2num(datetime(2023, 1, 2)),
+            dtclose=bt.date2num(datetime(2023, 1, 5)),
+            price=100.0,
+            size=0,
+            pnl=20.0,
+            commission=0.4,
+            history=[
+                SimpleNamespace(status=SimpleNamespace(size=2), event=SimpleNamespace(price=100.0)),
+                SimpleNamespace(status=SimpleNamespace(size=0), event=SimpleNamespace(price=110.0))
+            ]
+        )
+        open_trade = SimpleNamespace(isclosed=False, history=[])
+        # Same layout as bt.Strategy._trades: data feed -> trade id -> trades
+        strategy = SimpleNamespace(_trades={'data0': {0: [closed_trade], 1: [open_trade]}})
+        
+        trades = self.engine._extract_trades(strategy)
+        
+        self.assertEqual(len(trades), 1)
+        trade = trades[0]
+        self.assertEqual(trade['entry_time'], '2023-01-02 00:00:00')
+        self.assertEqual(trade['exit_time'], '2023-01-05 00:00:00')
+        self.assertEqual(trade['entry_price'], 100.0)
+        self.assertEqual(trade['exit_price'], 110.0)
+        self.assertEqual(trade['size'], 2)
+        self.assertEqual(trade['pnl'], 20.0)
+        self.assertAlmostEqual(trade['pnl_pct'], 10.0)
+        self.assertEqual(trade['commission'], 0.4)
+    
+    def test_extract_trades_from_cerebro(self):
+        """Test trade extraction from a real strategy run"""
+        cerebro = bt.Cerebro(tradehistory=True)
         data_feed = bt.feeds.PandasData(dataname=self.sample_data)
         cerebro.adddata(data_feed)
-        cerebro.addstrategy(RSICrossoverStrategy)
+        cerebro.addstrategy(RoundTripStrategy)
         
         strategies = cerebro.run()
         strategy = strategies[0]
         
         trades = self.engine._extract_trades(strategy)
-        self.assertIsInstance(trades, list)
-        # With random data, might or might not have trades
-        for trade in trades:
-            self.assertIsInstance(trade, dict)
-            self.assertIn('entry_time', trade)
-            self.assertIn('exit_time', trade)
-            self.assertIn('entry_price', trade)
-            self.assertIn('exit_price', trade)
-            self.assertIn('size', trade)
-            self.assertIn('pnl', trade)
-            self.assertIn('pnl_pct', trade)
+        
+        # Bought at the second bar's open, closed at the fourth bar's open
+        self.assertEqual(len(trades), 1)
+        trade = trades[0]
+        self.assertEqual(trade['entry_time'], '2023-01-02 00:00:00')
+        self.assertEqual(trade['exit_time'], '2023-01-04 00:00:00')
+        self.assertEqual(trade['entry_price'], 101.0)
+        self.assertEqual(trade['exit_price'], 103.0)
+        self.assertEqual(trade['size'], 1)
+        self.assertAlmostEqual(trade['pnl'], 2.0)
+        self.assertAlmostEqual(trade['pnl_pct'], 2.0 / 101.0 * 100)
     
     def test_plot_results_no_cerebro(self):
         """Test plotting when cerebro is None"""
@@ -215,11 +282,7 @@ class TestBacktraderEngine(unittest.TestCase):
             'rsi_overbought': 70
         }
         
-        results = self.engine.run_backtest(
-            strategy_class=RSICrossoverStrategy,
-            data=self.sample_data,
-            strategy_params=strategy_params
-        )
+        results = self.shared_backtest(strategy_params)
         
         # Check analyzer results are included
         self.assertIn('sharpe_ratio', results)
@@ -238,10 +301,7 @@ class TestBacktraderEngine(unittest.TestCase):
     
     def test_portfolio_value_tracking(self):
         """Test portfolio value is tracked correctly"""
-        results = self.engine.run_backtest(
-            strategy_class=RSICrossoverStrategy,
-            data=self.sample_data
-        )
+        results = self.shared_backtest()
         
         portfolio_values = results['portfolio_value']
         self.assertIsInstance(portfolio_values, list)
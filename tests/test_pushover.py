@@ -5,19 +5,40 @@ Tests for Pushover alert dispatcher
 import unittest
 import sys
 import os
-from unittest.mock import Mock, patch, MagicMock
+import http.client
+import urllib.parse
+from unittest.mock import Mock, patch, MagicMock, mock_open
 import json
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
 
+from src.alerts.pushover_dispatcher import PushoverDispatcher
+from src.alerts.alert_manager import AlertManager
+from src.config.config_manager import ConfigManager
+
+# Pushover API response bodies
+_OK_BODY = b'{"status": 1}'
+_ERR_BODY = b'{"status": 0, "errors": ["Invalid token"]}'
+
+# The real connection class, kept as a mock spec while http.client is patched
+_CONNECTION_SPEC = http.client.HTTPSConnection
+
 class TestPushoverDispatcher(unittest.TestCase):
     """Test Pushover alert dispatcher functionality"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Patch the HTTPS transport once for the whole class"""
+        cls._patcher = patch('http.client.HTTPSConnection')
+        cls.mock_https = cls._patcher.start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls._patcher.stop()
+    
     def setUp(self):
         """Set up test environment"""
-        from src.alerts.pushover_dispatcher import PushoverDispatcher
-        
         # Create test instance with mock credentials
         self.dispatcher = PushoverDispatcher(
             app_token="test_app_token",
@@ -26,11 +47,21 @@ class TestPushoverDispatcher(unittest.TestCase):
             priority=0,
             sound="pushover"
         )
+        
+        # Drop calls, responses and errors left over from the previous test
+        self.mock_https.reset_mock(side_effect=True)
+        self.mock_https.return_value = Mock(spec=_CONNECTION_SPEC)
+    
+    def _make_response(self, status=200, body=_OK_BODY):
+        """Serve a response with the given status and body from the patched connection"""
+        mock_response = Mock()
+        mock_response.status = status
+        mock_response.read.return_value = body
+        self.mock_https.return_value.getresponse.return_value = mock_response
+        return self.mock_https.return_value
     
     def test_dispatcher_initialization(self):
         """Test proper initialization"""
-        from src.alerts.pushover_dispatcher import PushoverDispatcher
-        
         # Test with valid credentials
         dispatcher = PushoverDispatcher(
             app_token="valid_token",
@@ -71,15 +102,14 @@ class TestPushoverDispatcher(unittest.TestCase):
         """Test priority setting and validation"""
         # Test valid priorities
         for priority in [-2, -1, 0, 1, 2]:
-            self.dispatcher.set_priority(priority)
-            assert self.dispatcher.priority == priority
-        
-        # Test invalid priority
-        with self.assertRaises(ValueError):
-            self.dispatcher.set_priority(3)
-        
-        with self.assertRaises(ValueError):
-            self.dispatcher.set_priority(-3)
+            with self.subTest(priority=priority):
+                self.dispatcher.set_priority(priority)
+                assert self.dispatcher.priority == priority
+        
+        # Test invalid priorities
+        for priority in [3, -3]:
+            with self.subTest(priority=priority), self.assertRaises(ValueError):
+                self.dispatcher.set_priority(priority)
     
     def test_sound_management(self):
         """Test sound setting"""
@@ -89,17 +119,10 @@ class TestPushoverDispatcher(unittest.TestCase):
         self.dispatcher.set_sound("siren")
         assert self.dispatcher.sound == "siren"
     
-    @patch('http.client.HTTPSConnection')
-    def test_send_trading_alert(self, mock_https):
+    def test_send_trading_alert(self):
         """Test sending trading alerts"""
         # Mock successful response
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.read.return_value = json.dumps({"status": 1}).encode()
-        
-        mock_conn = Mock()
-        mock_conn.getresponse.return_value = mock_response
-        mock_https.return_value = mock_conn
+        mock_conn = self._make_response()
         
         # Test trading alert
         success = self.dispatcher.send_alert("BUY", "AAPL", 150.00, 10.0)
@@ -116,17 +139,10 @@ class TestPushoverDispatcher(unittest.TestCase):
         # Verify HTTP request was made
         mock_conn.request.assert_called_once()
     
-    @patch('http.client.HTTPSConnection')
-    def test_send_custom_alert(self, mock_https):
+    def test_send_custom_alert(self):
         """Test sending custom alerts"""
         # Mock successful response
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.read.return_value = json.dumps({"status": 1}).encode()
-        
-        mock_conn = Mock()
-        mock_conn.getresponse.return_value = mock_response
-        mock_https.return_value = mock_conn
+        self._make_response()
         
         # Test custom alert
         success = self.dispatcher.send_custom_alert("Test message", "Test Title")
@@ -139,17 +155,33 @@ class TestPushoverDispatcher(unittest.TestCase):
         assert alert['message'] == "Test message"
         assert alert['title'] == "Test Title"
     
-    @patch('http.client.HTTPSConnection')
-    def test_send_strategy_signal(self, mock_https):
+    def test_request_payload_format(self):
+        """Test the form-encoded request sent to the Pushover API"""
+        mock_conn = self._make_response()
+        
+        self.dispatcher.send_custom_alert("Test message", "Test Title")
+        
+        expected_body = urllib.parse.urlencode({
+            "token": "test_app_token",
+            "user": "test_user_key",
+            "message": "Test message",
+            "title": "Test Title",
+            "priority": "0",
+            "sound": "pushover"
+        })
+        self.mock_https.assert_called_once_with("api.pushover.net:443")
+        mock_conn.request.assert_called_once_with(
+            "POST",
+            "/1/messages.json",
+            expected_body,
+            {"Content-type": "application/x-www-form-urlencoded"}
+        )
+        mock_conn.close.assert_called_once()
+    
+    def test_send_strategy_signal(self):
         """Test sending strategy signals"""
         # Mock successful response
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.read.return_value = json.dumps({"status": 1}).encode()
-        
-        mock_conn = Mock()
-        mock_conn.getresponse.return_value = mock_response
-        mock_https.return_value = mock_conn
+        self._make_response()
         
         # Test strategy signal
         conditions = ["RSI < 30", "Volume spike"]
@@ -167,17 +199,10 @@ class TestPushoverDispatcher(unittest.TestCase):
         assert alert['symbol'] == "BTC-USD"
         assert alert['conditions'] == conditions
     
-    @patch('http.client.HTTPSConnection')
-    def test_send_error_alert(self, mock_https):
+    def test_send_error_alert(self):
         """Test sending error alerts"""
         # Mock successful response
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.read.return_value = json.dumps({"status": 1}).encode()
-        
-        mock_conn = Mock()
-        mock_conn.getresponse.return_value = mock_response
-        mock_https.return_value = mock_conn
+        self._make_response()
         
         # Test error alert
         success = self.dispatcher.send_error_alert(
@@ -193,17 +218,10 @@ class TestPushoverDispatcher(unittest.TestCase):
         assert alert['message'] == "Failed to fetch data"
         assert alert['context'] == "test_context"
     
-    @patch('http.client.HTTPSConnection')
-    def test_send_market_update(self, mock_https):
+    def test_send_market_update(self):
         """Test sending market updates"""
         # Mock successful response
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.read.return_value = json.dumps({"status": 1}).encode()
-        
-        mock_conn = Mock()
-        mock_conn.getresponse.return_value = mock_response
-        mock_https.return_value = mock_conn
+        self._make_response()
         
         # Test market update
         success = self.dispatcher.send_market_update(
@@ -221,20 +239,10 @@ class TestPushoverDispatcher(unittest.TestCase):
         assert alert['change_percent'] == 3.45
         assert alert['volume'] == 1000000
     
-    @patch('http.client.HTTPSConnection')
-    def test_api_error_handling(self, mock_https):
+    def test_api_error_handling(self):
         """Test API error handling"""
         # Mock API error response
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.read.return_value = json.dumps({
-            "status": 0,
-            "errors": ["Invalid token"]
-        }).encode()
-        
-        mock_conn = Mock()
-        mock_conn.getresponse.return_value = mock_response
-        mock_https.return_value = mock_conn
+        self._make_response(body=_ERR_BODY)
         
         # Test failed alert
         success = self.dispatcher.send_alert("BUY", "AAPL", 150.00)
@@ -242,17 +250,10 @@ class TestPushoverDispatcher(unittest.TestCase):
         assert success is False
         assert len(self.dispatcher.alerts_history) == 1  # Still stored locally
     
-    @patch('http.client.HTTPSConnection')
-    def test_http_error_handling(self, mock_https):
+    def test_http_error_handling(self):
         """Test HTTP error handling"""
         # Mock HTTP error
-        mock_response = Mock()
-        mock_response.status = 400
-        mock_response.read.return_value = b"Bad Request"
-        
-        mock_conn = Mock()
-        mock_conn.getresponse.return_value = mock_response
-        mock_https.return_value = mock_conn
+        self._make_response(400, b"Bad Request")
         
         # Test failed alert
         success = self.dispatcher.send_alert("BUY", "AAPL", 150.00)
@@ -260,11 +261,10 @@ class TestPushoverDispatcher(unittest.TestCase):
         assert success is False
         assert len(self.dispatcher.alerts_history) == 1  # Still stored locally
     
-    @patch('http.client.HTTPSConnection')
-    def test_connection_error_handling(self, mock_https):
+    def test_connection_error_handling(self):
         """Test connection error handling"""
         # Mock connection error
-        mock_https.side_effect = Exception("Connection failed")
+        self.mock_https.side_effect = Exception("Connection failed")
         
         # Test failed alert
         success = self.dispatcher.send_alert("BUY", "AAPL", 150.00)
@@ -318,17 +318,10 @@ class TestPushoverDispatcher(unittest.TestCase):
         self.dispatcher.clear_history()
         assert len(self.dispatcher.alerts_history) == 0
     
-    @patch('http.client.HTTPSConnection')
-    def test_connection_test(self, mock_https):
+    def test_connection_test(self):
         """Test connection testing functionality"""
         # Mock successful response
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.read.return_value = json.dumps({"status": 1}).encode()
-        
-        mock_conn = Mock()
-        mock_conn.getresponse.return_value = mock_response
-        mock_https.return_value = mock_conn
+        self._make_response()
         
         # Test successful connection
         success = self.dispatcher.test_connection()
@@ -352,39 +345,38 @@ class TestPushoverDispatcher(unittest.TestCase):
             {"type": "custom", "message": "Test message"}
         ]
         
-        # Test export
-        filename = self.dispatcher.export_alerts("test_export.json")
+        # Test export into memory
+        with patch('src.alerts.pushover_dispatcher.open', mock_open(), create=True) as mocked_open:
+            filename = self.dispatcher.export_alerts("test_export.json")
         assert filename == "test_export.json"
+        mocked_open.assert_called_once_with("test_export.json", 'w')
         
-        # Verify file was created and contains correct data
-        try:
-            with open(filename, 'r') as f:
-                exported_data = json.load(f)
-            
-            assert len(exported_data) == 2
-            assert exported_data[0]["action"] == "BUY"
-            assert exported_data[1]["message"] == "Test message"
-            
-            # Cleanup
-            os.remove(filename)
-        except:
-            pass  # File operations might fail in test environment
+        # Verify the written data
+        written = "".join(call.args[0] for call in mocked_open().write.call_args_list)
+        exported_data = json.loads(written)
+        
+        assert len(exported_data) == 2
+        assert exported_data[0]["action"] == "BUY"
+        assert exported_data[1]["message"] == "Test message"
 
 class TestPushoverIntegration(unittest.TestCase):
     """Test Pushover integration with other system components"""
     
     def test_alert_manager_integration(self):
         """Test Pushover integration with AlertManager"""
-        from src.alerts.alert_manager import AlertManager
-        from src.config.config_manager import ConfigManager
-        
         # Create config with Pushover settings
         config = ConfigManager()
-        config.set('alerts.pushover.enabled', True)
-        config.set('alerts.pushover.app_token', 'test_token')
-        config.set('alerts.pushover.user_key', 'test_key')
-        config.set('alerts.pushover.priority', 1)
-        config.set('alerts.pushover.sound', 'bugle')
+        config.update_from_dict({
+            'alerts': {
+                'pushover': {
+                    'enabled': True,
+                    'app_token': 'test_token',
+                    'user_key': 'test_key',
+                    'priority': 1,
+                    'sound': 'bugle'
+                }
+            }
+        })
         
         # Create alert manager
         alert_manager = AlertManager(config)
@@ -400,8 +392,6 @@ class TestPushoverIntegration(unittest.TestCase):
     
     def test_config_integration(self):
         """Test Pushover configuration integration"""
-        from src.config.config_manager import ConfigManager
-        
         config = ConfigManager()
         
         # Test setting Pushover configuration
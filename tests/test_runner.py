@@ -3,21 +3,43 @@
 Test runner that can work with or without dependencies installed
 """
 import unittest
+import argparse
 import sys
 import os
+import shutil
+import subprocess
 from unittest.mock import Mock, MagicMock
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
 
+# Unit test modules run by run_mock_tests, sequentially or in parallel
+TEST_MODULES = [
+    'test_config',
+    'test_data_fetcher',
+    'test_strategies',
+    'test_engine',
+    'test_alerts'
+]
+
+# Names mocked by mock_missing_modules, or None before its first call
+_mocked_modules = None
+
 # Mock missing modules if they're not available
 def mock_missing_modules():
-    """Mock modules that might not be installed"""
+    """Mock modules that might not be installed, returning the names mocked"""
+    global _mocked_modules
+    
+    # Later calls would find every module in sys.modules; report the first pass instead
+    if _mocked_modules is not None:
+        return _mocked_modules
+    
     modules_to_mock = [
         'pandas', 'backtrader', 'backtrader.indicators', 'backtrader.feeds',
         'backtrader.analyzers', 'backtrader.observers', 'telegram', 'yfinance',
         'ccxt', 'plotly', 'plotly.graph_objects', 'streamlit'
     ]
+    mocked = []
     
     for module_name in modules_to_mock:
         if module_name not in sys.modules:
@@ -44,22 +66,24 @@ def mock_missing_modules():
                     mock_module.Bot = MagicMock
                 
                 sys.modules[module_name] = mock_module
+                mocked.append(module_name)
+    
+    _mocked_modules = mocked
+    return mocked
 
 def run_safe_tests():
     """Run tests that don't require external dependencies"""
-    # Mock modules first
-    mock_missing_modules()
-    
-    # Import test modules
+    # The config tests only need yaml, so nothing is mocked (or imported) here
     try:
         from test_config import TestConfigManager, TestIndicatorsConfig
         
         # Create test suite with only config tests
+        loader = unittest.TestLoader()
         suite = unittest.TestSuite()
         
         # Add config tests
-        suite.addTest(unittest.makeSuite(TestConfigManager))
-        suite.addTest(unittest.makeSuite(TestIndicatorsConfig))
+        suite.addTests(loader.loadTestsFromTestCase(TestConfigManager))
+        suite.addTests(loader.loadTestsFromTestCase(TestIndicatorsConfig))
         
         # Run tests
         runner = unittest.TextTestRunner(verbosity=2)
@@ -71,67 +95,109 @@ def run_safe_tests():
         print(f"Error running safe tests: {e}")
         return False
 
+def run_parallel_tests():
+    """Run the unit test classes concurrently across CPU cores with unittest-parallel"""
+    tests_dir = os.path.dirname(os.path.abspath(__file__))
+    success = True
+    
+    # One run per module, discovered exactly as the sequential path imports them
+    for module_name in TEST_MODULES:
+        result = subprocess.run([
+            'unittest-parallel',
+            '-t', tests_dir,
+            '-s', tests_dir,
+            '-p', f'{module_name}.py',
+            '--level', 'class'
+        ])
+        success = success and result.returncode == 0
+    
+    return success
+
+def config_tests_passed(result, config_test_count):
+    """Whether config tests ran in a finished in-process run and all of them passed"""
+    # A test_config import failure only warns, so make sure there were tests to pass
+    if not config_test_count:
+        return False
+    
+    failed = result.failures + result.errors
+    return not any(test.id().startswith('test_config.') for test, _ in failed)
+
 def run_mock_tests():
-    """Run all tests with mocked dependencies"""
+    """
+    Run all tests with mocked dependencies
+    
+    Returns:
+        (all passed, config tests passed); the latter is None after a parallel run,
+        which reports no per-test results
+    """
     # Mock modules first
-    mock_missing_modules()
-    
-    test_modules = [
-        'test_config',
-        'test_data_fetcher', 
-        'test_strategies',
-        'test_engine',
-        'test_alerts'
-    ]
+    mocked = mock_missing_modules()
     
+    # Worker processes only see real packages, so run in parallel when nothing was mocked
+    if not mocked and shutil.which('unittest-parallel'):
+        return run_parallel_tests(), None
+    
+    loader = unittest.TestLoader()
     suite = unittest.TestSuite()
+    config_test_count = 0
     
-    for module_name in test_modules:
+    for module_name in TEST_MODULES:
         try:
             module = __import__(module_name)
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if (isinstance(attr, type) and 
-                    issubclass(attr, unittest.TestCase) and 
-                    attr != unittest.TestCase):
-                    suite.addTest(unittest.makeSuite(attr))
+            module_tests = loader.loadTestsFromModule(module)
+            if module_name == 'test_config':
+                config_test_count = module_tests.countTestCases()
+            suite.addTests(module_tests)
         except Exception as e:
             print(f"Warning: Could not load test module {module_name}: {e}")
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
     
-    return result.wasSuccessful()
+    return result.wasSuccessful(), config_tests_passed(result, config_test_count)
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Backtrader Alerts test runner")
+    parser.add_argument('--mode', choices=['safe', 'mock', 'both'], default='both',
+                        help="safe: config tests only; mock: all tests with mocked "
+                             "dependencies; both: all tests, config results reported separately")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("BACKTRADER ALERTS SYSTEM - TEST RUNNER")
     print("=" * 60)
     
-    # First try safe tests (config only)
-    print("\n1. Running safe tests (configuration only)...")
-    safe_success = run_safe_tests()
+    safe_success = mock_success = None
     
-    print(f"\nSafe tests result: {'PASSED' if safe_success else 'FAILED'}")
-    
-    # Then try all tests with mocks
-    print("\n2. Running all tests with mocked dependencies...")
-    mock_success = run_mock_tests()
+    # All tests with mocks; the suite includes the config tests
+    if args.mode in ('mock', 'both'):
+        print("\nRunning all tests with mocked dependencies...")
+        mock_success, config_success = run_mock_tests()
+        print(f"\nMocked tests result: {'PASSED' if mock_success else 'FAILED'}")
+        
+        if args.mode == 'both':
+            safe_success = config_success
     
-    print(f"\nMocked tests result: {'PASSED' if mock_success else 'FAILED'}")
+    # Safe tests (config only), unless the full run already reported on them
+    if args.mode == 'safe' or (args.mode == 'both' and safe_success is None):
+        print("\nRunning safe tests (configuration only)...")
+        safe_success = run_safe_tests()
+        print(f"\nSafe tests result: {'PASSED' if safe_success else 'FAILED'}")
     
     # Summary
     print("\n" + "=" * 60)
     print("TEST SUMMARY:")
-    print(f"Configuration tests: {'✓ PASSED' if safe_success else '✗ FAILED'}")
-    print(f"All tests (mocked):  {'✓ PASSED' if mock_success else '✗ FAILED'}")
+    if safe_success is not None:
+        print(f"Configuration tests: {'✓ PASSED' if safe_success else '✗ FAILED'}")
+    if mock_success is not None:
+        print(f"All tests (mocked):  {'✓ PASSED' if mock_success else '✗ FAILED'}")
     print("=" * 60)
     
-    if not safe_success:
+    if safe_success is False:
         print("\n⚠️  Configuration tests failed - check config_manager.py")
     
-    if not mock_success:
+    if mock_success is False:
         print("\n⚠️  Some tests failed - check individual modules")
-    else:
+    elif mock_success:
         print("\n✅ All tests passed with mocked dependencies!")
         print("💡 Install requirements.txt for full testing with real dependencies")
\ No newline at end of file
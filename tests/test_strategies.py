@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 import pandas as pd
 import backtrader as bt
 from datetime import datetime, timedelta
@@ -11,31 +12,46 @@ from src.strategies.rsi_crossover import RSICrossoverStrategy
 from src.strategies.multi_indicator import SimpleIndicatorStrategy, MultiIndicatorStrategy
 from src.strategies.multi_timeframe import MultiTimeframeStrategy
 
+# Sample OHLCV columns, built once as float64 so PandasData needs no type conversion
+_OPEN = np.arange(100, 110, dtype=np.float64)
+_SAMPLE_DF = pd.DataFrame({
+    'open': _OPEN,
+    'high': _OPEN + 5,
+    'low': _OPEN - 5,
+    'close': _OPEN + 2,
+    'volume': np.arange(1000, 2000, 100, dtype=np.float64)
+}, index=pd.date_range('2023-01-01', periods=10, freq='D'), copy=False)
+
+def _make_cerebro(data):
+    """Fresh Cerebro fed with data; feeds hold per-run state, so they are never reused"""
+    cerebro = bt.Cerebro()
+    cerebro.adddata(bt.feeds.PandasData(dataname=data))
+    return cerebro
+
 class TestRSICrossoverStrategy(unittest.TestCase):
     
-    def setUp(self):
-        self.sample_data = pd.DataFrame({
-            'open': [100, 101, 102, 103, 104, 105, 106, 107, 108, 109],
-            'high': [105, 106, 107, 108, 109, 110, 111, 112, 113, 114],
-            'low': [95, 96, 97, 98, 99, 100, 101, 102, 103, 104],
-            'close': [102, 103, 104, 105, 106, 107, 108, 109, 110, 111],
-            'volume': [1000, 1100, 1200, 1300, 1400, 1500, 1600, 1700, 1800, 1900]
-        }, index=pd.date_range('2023-01-01', periods=10, freq='D'))
+    @classmethod
+    def setUpClass(cls):
+        cls.sample_data = _SAMPLE_DF
+        
+        # Finished strategies keyed by their params; the tests only inspect them
+        cls._strategies = {}
+    
+    def run_strategy(self, **params):
+        """RSICrossoverStrategy run on sample_data, once per distinct params"""
+        key = tuple(sorted(params.items()))
+        if key not in self._strategies:
+            cerebro = _make_cerebro(self.sample_data)
+            cerebro.addstrategy(RSICrossoverStrategy, **params)
+            self._strategies[key] = cerebro.run()[0]
+        return self._strategies[key]
     
     def test_rsi_strategy_params(self):
         """Test RSI strategy parameter setting"""
-        cerebro = bt.Cerebro()
-        data_feed = bt.feeds.PandasData(dataname=self.sample_data)
-        cerebro.adddata(data_feed)
-        
-        # Add strategy with custom parameters
-        cerebro.addstrategy(RSICrossoverStrategy, 
-                          rsi_period=21, 
-                          rsi_oversold=25, 
-                          rsi_overbought=75)
-        
-        strategies = cerebro.run()
-        strategy = strategies[0]
+        # Run strategy with custom parameters
+        strategy = self.run_strategy(rsi_period=21, 
+                                     rsi_oversold=25, 
+                                     rsi_overbought=75)
         
         self.assertEqual(strategy.params.rsi_period, 21)
         self.assertEqual(strategy.params.rsi_oversold, 25)
@@ -43,34 +59,22 @@ class TestRSICrossoverStrategy(unittest.TestCase):
     
     def test_rsi_strategy_initialization(self):
         """Test RSI strategy initialization"""
-        cerebro = bt.Cerebro()
-        data_feed = bt.feeds.PandasData(dataname=self.sample_data)
-        cerebro.adddata(data_feed)
-        
-        cerebro.addstrategy(RSICrossoverStrategy)
-        strategies = cerebro.run()
-        strategy = strategies[0]
+        strategy = self.run_strategy()
         
         # Check that RSI indicator is created
         self.assertTrue(hasattr(strategy, 'rsi'))
         self.assertIsNotNone(strategy.rsi)
+        self.assertEqual(strategy.params.rsi_period, 14)
 
 class TestSimpleIndicatorStrategy(unittest.TestCase):
     
-    def setUp(self):
-        self.sample_data = pd.DataFrame({
-            'open': [100, 101, 102, 103, 104, 105, 106, 107, 108, 109],
-            'high': [105, 106, 107, 108, 109, 110, 111, 112, 113, 114],
-            'low': [95, 96, 97, 98, 99, 100, 101, 102, 103, 104],
-            'close': [102, 103, 104, 105, 106, 107, 108, 109, 110, 111],
-            'volume': [1000, 1100, 1200, 1300, 1400, 1500, 1600, 1700, 1800, 1900]
-        }, index=pd.date_range('2023-01-01', periods=10, freq='D'))
+    @classmethod
+    def setUpClass(cls):
+        cls.sample_data = _SAMPLE_DF
     
     def test_simple_indicator_strategy_rsi(self):
         """Test Simple Indicator Strategy with RSI"""
-        cerebro = bt.Cerebro()
-        data_feed = bt.feeds.PandasData(dataname=self.sample_data)
-        cerebro.adddata(data_feed)
+        cerebro = _make_cerebro(self.sample_data)
         
         cerebro.addstrategy(SimpleIndicatorStrategy,
                           indicator_type='RSI',
@@ -90,9 +94,7 @@ class TestSimpleIndicatorStrategy(unittest.TestCase):
     
     def test_simple_indicator_strategy_sma(self):
         """Test Simple Indicator Strategy with SMA"""
-        cerebro = bt.Cerebro()
-        data_feed = bt.feeds.PandasData(dataname=self.sample_data)
-        cerebro.adddata(data_feed)
+        cerebro = _make_cerebro(self.sample_data)
         
         cerebro.addstrategy(SimpleIndicatorStrategy,
                           indicator_type='SMA',
@@ -110,36 +112,25 @@ class TestSimpleIndicatorStrategy(unittest.TestCase):
     
     def test_check_condition_operators(self):
         """Test condition checking with different operators"""
-        cerebro = bt.Cerebro()
-        data_feed = bt.feeds.PandasData(dataname=self.sample_data)
-        cerebro.adddata(data_feed)
-        
-        cerebro.addstrategy(SimpleIndicatorStrategy,
-                          indicator_type='RSI',
-                          indicator_params={'period': 14})
-        
-        strategies = cerebro.run()
-        strategy = strategies[0]
-        
-        # Test different operators
-        self.assertTrue(strategy.check_condition(50, 30, '>'))
-        self.assertFalse(strategy.check_condition(20, 30, '>'))
-        self.assertTrue(strategy.check_condition(20, 30, '<'))
-        self.assertFalse(strategy.check_condition(50, 30, '<'))
-        self.assertTrue(strategy.check_condition(30, 30, '>='))
-        self.assertTrue(strategy.check_condition(30, 30, '<='))
-        self.assertTrue(strategy.check_condition(30, 30, '=='))
+        cases = [
+            (50, 30, '>', True),
+            (20, 30, '>', False),
+            (20, 30, '<', True),
+            (50, 30, '<', False),
+            (30, 30, '>=', True),
+            (30, 30, '<=', True),
+            (30, 30, '==', True),
+            (30, 30, '!=', False),  # Unsupported operator
+        ]
+        for ind_value, threshold, operator, expected in cases:
+            with self.subTest(ind_value=ind_value, threshold=threshold, operator=operator):
+                self.assertEqual(SimpleIndicatorStrategy.check_condition(ind_value, threshold, operator), expected)
 
 class TestMultiIndicatorStrategy(unittest.TestCase):
     
-    def setUp(self):
-        self.sample_data = pd.DataFrame({
-            'open': [100, 101, 102, 103, 104, 105, 106, 107, 108, 109],
-            'high': [105, 106, 107, 108, 109, 110, 111, 112, 113, 114],
-            'low': [95, 96, 97, 98, 99, 100, 101, 102, 103, 104],
-            'close': [102, 103, 104, 105, 106, 107, 108, 109, 110, 111],
-            'volume': [1000, 1100, 1200, 1300, 1400, 1500, 1600, 1700, 1800, 1900]
-        }, index=pd.date_range('2023-01-01', periods=10, freq='D'))
+    @classmethod
+    def setUpClass(cls):
+        cls.sample_data = _SAMPLE_DF
     
     def test_multi_indicator_strategy_initialization(self):
         """Test Multi-Indicator Strategy initialization"""
@@ -156,9 +147,7 @@ class TestMultiIndicatorStrategy(unittest.TestCase):
             {'indicator': 'rsi', 'operator': '>', 'value': 70}
         ]
         
-        cerebro = bt.Cerebro()
-        data_feed = bt.feeds.PandasData(dataname=self.sample_data)
-        cerebro.adddata(data_feed)
+        cerebro = _make_cerebro(self.sample_data)
         
         cerebro.addstrategy(MultiIndicatorStrategy,
                           indicators=indicators_config,
@@ -178,9 +167,7 @@ class TestMultiIndicatorStrategy(unittest.TestCase):
             'rsi': {'type': 'RSI', 'params': {'period': 14}}
         }
         
-        cerebro = bt.Cerebro()
-        data_feed = bt.feeds.PandasData(dataname=self.sample_data)
-        cerebro.adddata(data_feed)
+        cerebro = _make_cerebro(self.sample_data)
         
         cerebro.addstrategy(MultiIndicatorStrategy, indicators=indicators_config)
         strategies = cerebro.run()
@@ -204,9 +191,7 @@ class TestMultiIndicatorStrategy(unittest.TestCase):
     
     def test_check_conditions_empty(self):
         """Test condition checking with empty conditions"""
-        cerebro = bt.Cerebro()
-        data_feed = bt.feeds.PandasData(dataname=self.sample_data)
-        cerebro.adddata(data_feed)
+        cerebro = _make_cerebro(self.sample_data)
         
         cerebro.addstrategy(MultiIndicatorStrategy)
         strategies = cerebro.run()
@@ -218,14 +203,9 @@ class TestMultiIndicatorStrategy(unittest.TestCase):
 
 class TestMultiTimeframeStrategy(unittest.TestCase):
     
-    def setUp(self):
-        self.sample_data = pd.DataFrame({
-            'open': [100, 101, 102, 103, 104],
-            'high': [105, 106, 107, 108, 109],
-            'low': [95, 96, 97, 98, 99],
-            'close': [102, 103, 104, 105, 106],
-            'volume': [1000, 1100, 1200, 1300, 1400]
-        }, index=pd.date_range('2023-01-01', periods=5, freq='D'))
+    @classmethod
+    def setUpClass(cls):
+        cls.sample_data = _SAMPLE_DF.iloc[:5]
     
     def test_multi_timeframe_strategy_initialization(self):
         """Test Multi-Timeframe Strategy initialization"""
@@ -275,11 +255,9 @@ class TestMultiTimeframeStrategy(unittest.TestCase):
     
     def test_evaluate_price_condition(self):
         """Test price condition evaluation"""
-        cerebro = bt.Cerebro()
-        data_feed = bt.feeds.PandasData(dataname=self.sample_data)
-        cerebro.adddata(data_feed)
+        cerebro = _make_cerebro(self.sample_data)
         
-        timeframe_configs = {'1h': {'data': data_feed, 'indicators': {}}}
+        timeframe_configs = {'1h': {'data': cerebro.datas[0], 'indicators': {}}}
         
         cerebro.addstrategy(MultiTimeframeStrategy, timeframe_configs=timeframe_configs)
         strategies = cerebro.run()
@@ -296,9 +274,7 @@ class TestMultiTimeframeStrategy(unittest.TestCase):
     
     def test_check_condition_group(self):
         """Test condition group checking"""
-        cerebro = bt.Cerebro()
-        data_feed = bt.feeds.PandasData(dataname=self.sample_data)
-        cerebro.adddata(data_feed)
+        cerebro = _make_cerebro(self.sample_data)
         
         cerebro.addstrategy(MultiTimeframeStrategy)
         strategies = cerebro.run()
@@ -319,20 +295,13 @@ class TestMultiTimeframeStrategy(unittest.TestCase):
 class TestStrategyBase(unittest.TestCase):
     """Test common strategy functionality"""
     
-    def setUp(self):
-        self.sample_data = pd.DataFrame({
-            'open': [100, 101, 102, 103, 104],
-            'high': [105, 106, 107, 108, 109],
-            'low': [95, 96, 97, 98, 99],
-            'close': [102, 103, 104, 105, 106],
-            'volume': [1000, 1100, 1200, 1300, 1400]
-        }, index=pd.date_range('2023-01-01', periods=5, freq='D'))
+    @classmethod
+    def setUpClass(cls):
+        cls.sample_data = _SAMPLE_DF.iloc[:5]
     
     def test_strategy_logging(self):
         """Test strategy logging functionality"""
-        cerebro = bt.Cerebro()
-        data_feed = bt.feeds.PandasData(dataname=self.sample_data)
-        cerebro.adddata(data_feed)
+        cerebro = _make_cerebro(self.sample_data)
         
         cerebro.addstrategy(RSICrossoverStrategy, printlog=True)
         strategies = cerebro.run()
@@ -351,9 +320,7 @@ class TestStrategyBase(unittest.TestCase):
         """Test strategy with alert dispatcher"""
         mock_dispatcher = Mock()
         
-        cerebro = bt.Cerebro()
-        data_feed = bt.feeds.PandasData(dataname=self.sample_data)
-        cerebro.adddata(data_feed)
+        cerebro = _make_cerebro(self.sample_data)
         
         cerebro.addstrategy(RSICrossoverStrategy, alert_dispatcher=mock_dispatcher)
         strategies = cerebro.run()